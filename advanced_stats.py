@@ -0,0 +1,93 @@
+"""Margin-adjusted team ratings (SRS) and strength of schedule.
+
+Every game is one row of a sparse least-squares system: team1's rating
+minus team2's rating should equal the score margin. One more row pins
+the average rating to zero. The solution is each team's Simple Rating
+System value, in points better than an average team, and its strength
+of schedule is the average rating of the opponents it played.
+
+Results are cached per league and season until the league's data
+version changes.
+"""
+import threading
+
+import numpy as np
+from scipy.sparse import coo_matrix
+from scipy.sparse.linalg import lsqr
+
+import history
+
+# Blowout margins count for at most this many points
+MARGIN_CAP = 28
+
+_cache = {}
+_cache_lock = threading.Lock()
+
+
+def solve_srs(team1, team2, margins, team_count):
+    """Least-squares ratings for games given as team index and margin arrays."""
+    game_count = len(margins)
+    rows = np.concatenate((np.arange(game_count), np.arange(game_count), np.full(team_count, game_count)))
+    cols = np.concatenate((team1, team2, np.arange(team_count)))
+    values = np.concatenate((np.ones(game_count), -np.ones(game_count), np.ones(team_count)))
+    matrix = coo_matrix((values, (rows, cols)), shape=(game_count + 1, team_count)).tocsr()
+    target = np.append(margins, 0.0)
+    return lsqr(matrix, target, atol=1e-10, btol=1e-10)[0]
+
+
+def compute_team_metrics(games, margin_cap=MARGIN_CAP):
+    """Get SRS, margin of victory and strength of schedule for every team in games.
+
+    Returns (team, {'srs', 'mov', 'sos', 'games'}) pairs, best SRS first.
+    """
+    teams = {}
+    team1, team2, margins = [], [], []
+    for game in games:
+        team1.append(teams.setdefault(game['team1'], len(teams)))
+        team2.append(teams.setdefault(game['team2'], len(teams)))
+        margins.append(game['score1'] - game['score2'])
+    if not teams:
+        return []
+
+    team1, team2 = np.array(team1), np.array(team2)
+    margins = np.clip(np.array(margins, dtype=float), -margin_cap, margin_cap)
+    srs = solve_srs(team1, team2, margins, len(teams))
+
+    played = np.bincount(team1, minlength=len(teams)) + np.bincount(team2, minlength=len(teams))
+    margin_total = (np.bincount(team1, weights=margins, minlength=len(teams))
+                    - np.bincount(team2, weights=margins, minlength=len(teams)))
+    opponent_total = (np.bincount(team1, weights=srs[team2], minlength=len(teams))
+                      + np.bincount(team2, weights=srs[team1], minlength=len(teams)))
+
+    names = list(teams)
+    metrics = [
+        (names[i], {
+            'srs': float(srs[i]),
+            'mov': float(margin_total[i] / played[i]),
+            'sos': float(opponent_total[i] / played[i]),
+            'games': int(played[i])
+        })
+        for i in range(len(names))
+    ]
+    return sorted(metrics, key=lambda item: -item[1]['srs'])
+
+
+def get_team_metrics(season=None, guild_id=None):
+    """Get a league's team metrics for one season (or all time), computing them once per data version."""
+    key = (history.league_data_dir(guild_id), season)
+    version = history.data_version(guild_id)
+    with _cache_lock:
+        cached = _cache.get(key)
+    if cached and cached[0] == version:
+        return cached[1]
+
+    games = (
+        game
+        for chunk in history.get_store(guild_id).iter_games()
+        for game in chunk
+        if season is None or game['season'] == season
+    )
+    metrics = compute_team_metrics(games)
+    with _cache_lock:
+        _cache[key] = (version, metrics)
+    return metrics
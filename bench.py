@@ -0,0 +1,213 @@
+"""Synthetic league generator and benchmarks for the history and lookup paths.
+
+Generate a league in the data/ CSV format, then time each query path:
+
+    python bench.py generate bench_data --seasons 100 --weeks 14 --games-per-week 700
+    python bench.py run bench_data --backend memory --output results.json
+    python bench.py compare old.json results.json
+
+Results are written as JSON so runs can be compared against each other.
+"""
+import argparse
+import csv
+import json
+import os
+import platform
+import random
+import shutil
+import statistics
+import sys
+import tempfile
+import time
+from datetime import datetime
+
+import history
+import advanced_stats
+import ratings
+from cfb_teams import CFB_TEAMS, find_team, search_teams
+from storage import CoachingJournal, TeamRegistry
+
+AUTOCOMPLETE_QUERIES = ['', 'a', 'ge', 'osu', 'state', 'texas', 'bama', 'north caro', 'zzz']
+
+
+def generate_league(out_dir, seasons, weeks, teams, games_per_week, seed=0):
+    """Write synthetic game_history.csv and season_history.csv files into out_dir."""
+    rng = random.Random(seed)
+    names = sorted(CFB_TEAMS)[:teams]
+    games_per_week = games_per_week or len(names) // 2
+    first_season = datetime.now().year - seasons
+    os.makedirs(out_dir, exist_ok=True)
+
+    game_count = 0
+    with open(os.path.join(out_dir, 'game_history.csv'), 'w', newline='', encoding='utf-8') as f:
+        writer = csv.writer(f)
+        writer.writerow(history.GAME_FIELDS)
+        for season in range(first_season, first_season + seasons):
+            for week in range(1, weeks + 1):
+                for _ in range(games_per_week):
+                    team1, team2 = rng.sample(names, 2)
+                    writer.writerow([season, week, team1, team2, rng.randint(0, 56), rng.randint(0, 56)])
+                    game_count += 1
+
+    with open(os.path.join(out_dir, 'season_history.csv'), 'w', newline='', encoding='utf-8') as f:
+        writer = csv.writer(f)
+        writer.writerow(history.SEASON_FIELDS)
+        for season in range(first_season, first_season + seasons):
+            champion, runner_up = rng.sample(names, 2)
+            writer.writerow([season, champion, runner_up, f"Player {season}", champion])
+
+    return game_count
+
+
+def time_calls(func, args_list, repeat):
+    """Time func over each argument tuple, repeat times, and summarize in milliseconds."""
+    samples = []
+    for _ in range(repeat):
+        for args in args_list:
+            start = time.perf_counter()
+            func(*args)
+            samples.append((time.perf_counter() - start) * 1000)
+    samples.sort()
+    return {
+        'calls': len(samples),
+        'min_ms': samples[0],
+        'median_ms': statistics.median(samples),
+        'p95_ms': samples[min(len(samples) - 1, int(len(samples) * 0.95))],
+        'max_ms': samples[-1],
+    }
+
+
+def open_backend(data_dir, backend, work_dir):
+    """Point history.py at data_dir with the chosen backend and return a load function."""
+    history.DATA_DIR = data_dir
+    os.environ.pop('HISTORY_DB', None)
+    os.environ.pop('HISTORY_BACKEND', None)
+    if backend == 'sqlite':
+        from history_db import migrate_csv
+        db_path = os.path.join(work_dir, 'history.db')
+        migrate_csv(db_path, data_dir)
+        os.environ['HISTORY_DB'] = db_path
+    elif backend == 'columnar':
+        os.environ['HISTORY_BACKEND'] = 'columnar'
+    return history.load_store
+
+
+def run_benchmarks(data_dir, backend, repeat, seed=0):
+    """Time every query path against a copy of the league in data_dir."""
+    rng = random.Random(seed)
+    work_dir = tempfile.mkdtemp(prefix='cfb_bench_')
+    results = {}
+    try:
+        # Benchmark a copy of the CSVs, so the cold load's snapshot is written there and not in data_dir
+        league_dir = os.path.join(work_dir, 'data')
+        os.makedirs(league_dir)
+        for filename in ('game_history.csv', 'season_history.csv'):
+            if os.path.exists(os.path.join(data_dir, filename)):
+                shutil.copy(os.path.join(data_dir, filename), league_dir)
+        load = open_backend(league_dir, backend, work_dir)
+
+        results['load_cold'] = time_calls(load, [()], 1)
+        results['load_warm'] = time_calls(load, [()], repeat)
+
+        store = history.get_store()
+        game_count = sum(r['wins'] + r['losses'] for _, r in store.standings()) // 2
+        seasons = history.get_all_seasons()
+        teams = [team for team, _ in history.get_standings()]
+        pairs = [tuple(rng.sample(teams, 2)) for _ in range(20)] if len(teams) > 1 else []
+
+        results['get_standings_all_time'] = time_calls(history.get_standings, [()], repeat)
+        results['get_standings_season'] = time_calls(history.get_standings, [(s,) for s in seasons[:10]], repeat)
+        results['get_head_to_head'] = time_calls(history.get_head_to_head, pairs, repeat)
+        results['get_team_history'] = time_calls(history.get_team_history, [(t,) for t in teams[:20]], repeat)
+        results['get_championships'] = time_calls(history.get_championships, [()], repeat)
+        results['get_all_seasons'] = time_calls(history.get_all_seasons, [()], repeat)
+        all_games = [game for chunk in store.iter_games() for game in chunk]
+        results['ratings_recompute'] = time_calls(ratings.compute_ratings, [(all_games,)], repeat)
+        results['get_rankings'] = time_calls(ratings.get_rankings, [()], repeat)
+        results['team_metrics_season'] = time_calls(advanced_stats.compute_team_metrics,
+                                                    [([g for g in all_games if g['season'] == seasons[0]],)], repeat)
+        results['team_autocomplete'] = time_calls(search_teams, [(q,) for q in AUTOCOMPLETE_QUERIES], repeat)
+        results['find_team'] = time_calls(find_team, [(q,) for q in AUTOCOMPLETE_QUERIES], repeat)
+
+        # Registration and coaching JSON paths, against throwaway files
+        registry = TeamRegistry(os.path.join(work_dir, 'registered_teams.json'), save_delay=3600)
+        names = sorted(CFB_TEAMS)
+        results['register'] = time_calls(registry.register, [(i, rng.choice(names)) for i in range(500)], 1)
+        results['registry_flush'] = time_calls(registry.flush, [()], 1)
+        results['registry_lookup'] = time_calls(registry.get_team, [(i,) for i in range(500)], repeat)
+
+        journal = CoachingJournal(os.path.join(work_dir, 'coaching_history.jsonl'))
+        entry = {'user_id': '1', 'user_name': 'Coach', 'old_team': 'Georgia', 'new_team': 'Texas',
+                 'date': datetime.now().isoformat()}
+        results['coaching_append'] = time_calls(journal.append, [(entry,)] * 1000, 1)
+        results['coaching_tail'] = time_calls(journal.tail, [(10,)], repeat)
+    finally:
+        shutil.rmtree(work_dir, ignore_errors=True)
+
+    return {
+        'meta': {
+            'backend': backend,
+            'data_dir': os.path.abspath(data_dir),
+            'games': game_count,
+            'seasons': len(seasons),
+            'teams': len(teams),
+            'repeat': repeat,
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'timestamp': datetime.now().isoformat(),
+        },
+        'results': results,
+    }
+
+
+def compare_results(old, new):
+    """Print the median change for each benchmark present in both runs."""
+    print(f"{'benchmark':<26} {'old ms':>10} {'new ms':>10} {'change':>8}")
+    for name, result in new['results'].items():
+        if name not in old['results']:
+            continue
+        before, after = old['results'][name]['median_ms'], result['median_ms']
+        change = f"{(after - before) / before * 100:+.0f}%" if before else 'n/a'
+        print(f"{name:<26} {before:>10.3f} {after:>10.3f} {change:>8}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    generate = subparsers.add_parser('generate', help='Generate a synthetic league')
+    generate.add_argument('out_dir')
+    generate.add_argument('--seasons', type=int, default=20)
+    generate.add_argument('--weeks', type=int, default=14)
+    generate.add_argument('--teams', type=int, default=len(CFB_TEAMS))
+    generate.add_argument('--games-per-week', type=int, default=0, help='Defaults to teams / 2')
+    generate.add_argument('--seed', type=int, default=0)
+
+    run = subparsers.add_parser('run', help='Time the query paths')
+    run.add_argument('data_dir')
+    run.add_argument('--backend', choices=['memory', 'sqlite', 'columnar'], default='memory')
+    run.add_argument('--repeat', type=int, default=5)
+    run.add_argument('--output', help='Write JSON results here instead of stdout')
+
+    compare = subparsers.add_parser('compare', help='Compare two JSON result files')
+    compare.add_argument('old')
+    compare.add_argument('new')
+
+    args = parser.parse_args(argv)
+    if args.command == 'generate':
+        count = generate_league(args.out_dir, args.seasons, args.weeks, args.teams, args.games_per_week, args.seed)
+        print(f"Wrote {count} game(s) to {args.out_dir}")
+    elif args.command == 'run':
+        output = json.dumps(run_benchmarks(args.data_dir, args.backend, args.repeat), indent=2)
+        if args.output:
+            with open(args.output, 'w') as f:
+                f.write(output + '\n')
+        else:
+            print(output)
+    else:
+        with open(args.old) as f_old, open(args.new) as f_new:
+            compare_results(json.load(f_old), json.load(f_new))
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -1,118 +1,479 @@
 import os
 import json
+import time
+import gzip
+import shutil
+import asyncio
+import hashlib
+import tempfile
+import contextvars
 import discord
 from discord import app_commands
 from discord.ext import commands
 from dotenv import load_dotenv
+from collections import OrderedDict
 from datetime import datetime
-from cfb_teams import get_team_info, find_team, get_all_teams
+import metrics
+from cfb_teams import get_team_info, find_team, get_all_teams, search_teams
+from storage import run_storage, home_guild_id, write_json_atomic, write_bytes_atomic
+from leagues import get_league
+from ratings import get_rankings
+from advanced_stats import get_team_metrics, MARGIN_CAP
+from projections import project_season, DEFAULT_SIMULATIONS, MAX_SIMULATIONS, REGULAR_SEASON_WEEKS, PLAYOFF_TEAMS
 from history import (
-    save_game, save_season, get_standings, get_head_to_head,
-    get_team_history, get_championships, get_all_seasons
+    save_game, save_season, get_head_to_head, get_all_seasons, load_store, data_version,
+    get_standings_page, get_team_history_page, get_championships_page,
+    parse_games_csv, save_games, export_games
 )
 
 # Load environment variables
 load_dotenv()
 
 TOKEN = os.getenv('DISCORD_TOKEN')
-READY_CHANNEL_ID = int(os.getenv('READY_CHANNEL_ID', 0))
-PLAYER_COUNT = int(os.getenv('PLAYER_COUNT', 4))
 
-# File to store team registrations
-TEAMS_FILE = 'registered_teams.json'
-COACHING_HISTORY_FILE = 'coaching_history.json'
 
-# Bot setup
+# Discord drops a slash command that isn't acknowledged within 3 seconds, so
+# commands still working after AUTO_DEFER_AFTER are deferred automatically
+AUTO_DEFER_AFTER = 2.0
+# Seconds a command may run in total before it's cancelled
+DEFAULT_COMMAND_BUDGET = 10.0
+COMMAND_BUDGETS = {
+    'projections': 60.0,
+    'exportgames': 60.0,
+}
+# Commands that save something. Their writes can't be called back once
+# handed to the storage threads, so they're never cancelled: the user gets
+# the real result late rather than a "try again" that would save it twice.
+WRITE_COMMANDS = {'register', 'ready', 'unready', 'advance', 'leaguesettings', 'loggame', 'importgames',
+                  'logseason'}
+# Commands whose replies are only shown to the user, so an automatic defer is
+# too; other commands' ephemeral replies replace a public defer (see respond)
+EPHEMERAL_COMMANDS = {'teamlist', 'ready', 'unready', 'status', 'leaguesettings', 'botstats'}
+
+
+class InteractionDeadline:
+    """Watches one slash command against Discord's deadline and its latency budget.
+
+    If the command hasn't responded AUTO_DEFER_AFTER seconds in, the
+    interaction is deferred, and respond() sends the result as a followup.
+    Once the budget of a read-only command runs out, its task is cancelled
+    (with any pending process pool work) and the user is told it took too
+    long. WRITE_COMMANDS are only logged as over budget.
+    """
+
+    def __init__(self, interaction, name):
+        self.interaction = interaction
+        self.name = name
+        self.budget = COMMAND_BUDGETS.get(name, DEFAULT_COMMAND_BUDGET)
+        self.expired = False
+        self.command_task = asyncio.current_task()
+        # Run outside the command's timing context, so the watchdog's own defer isn't counted as its REST time
+        self.watchdog = contextvars.Context().run(asyncio.create_task, self._watch())
+
+    async def _watch(self):
+        await asyncio.sleep(AUTO_DEFER_AFTER)
+        await defer(self.interaction, ephemeral=self.name in EPHEMERAL_COMMANDS, thinking=True)
+
+        await asyncio.sleep(self.budget - AUTO_DEFER_AFTER)
+        if self.command_task is None or self.command_task.done():
+            return
+        if self.name in WRITE_COMMANDS:
+            print(f'/{self.name} is past its {self.budget:g}s budget; letting the write finish', flush=True)
+            return
+        self.expired = True
+        self.command_task.cancel()
+        print(f'/{self.name} ran past its {self.budget:g}s budget and was cancelled', flush=True)
+        try:
+            await respond(self.interaction, "That took too long and was cancelled. Please try again later.",
+                          ephemeral=True)
+        except discord.HTTPException:
+            pass
+        metrics.finish_command(self.interaction.extras.get('timing'), error=True)
+
+    def stop(self):
+        self.watchdog.cancel()
+
+
+class InstrumentedCommandTree(app_commands.CommandTree):
+    """Command tree that times every slash command and holds it to its deadline."""
+
+    async def interaction_check(self, interaction: discord.Interaction) -> bool:
+        if interaction.type == discord.InteractionType.application_command:
+            name = interaction.command.qualified_name if interaction.command else interaction.data.get('name')
+            interaction.extras['timing'] = metrics.start_command(name)
+            interaction.extras['deadline'] = InteractionDeadline(interaction, name)
+        return True
+
+    def finish_interaction(self, interaction, error=False):
+        """Stop a finished command's deadline watchdog and record its timing."""
+        deadline = interaction.extras.get('deadline')
+        if deadline is not None:
+            deadline.stop()
+        metrics.finish_command(interaction.extras.get('timing'), error=error)
+
+
+# Bot setup, sharded automatically so one process can serve many leagues
 intents = discord.Intents.default()
-bot = commands.Bot(command_prefix='!', intents=intents)
-
-# Track who's ready
-ready_players = set()
-
-
-def load_teams():
-    """Load registered teams from JSON file."""
-    if os.path.exists(TEAMS_FILE):
-        with open(TEAMS_FILE, 'r') as f:
-            return json.load(f)
-    return {}
+intents.members = True
+bot = commands.AutoShardedBot(command_prefix='!', intents=intents, tree_cls=InstrumentedCommandTree)
+
+# Cached member display names: (guild_id, user_id) -> (display_name, expires_at)
+MEMBER_NAME_TTL = 600
+MEMBER_FETCH_CONCURRENCY = 8
+member_names = {}
+
+# One live ready board per league: guild_id -> ReadyBoard
+BOARD_DEBOUNCE = 2.0
+ready_boards = {}
+
+# Hash of the last command tree synced to each scope, to skip redundant syncs
+COMMAND_SYNC_FILE = 'command_sync.json'
+command_sync_task = None
+
+# Optional Prometheus text dumps of the command latency histograms
+METRICS_FILE = os.getenv('METRICS_FILE')
+METRICS_PORT = int(os.getenv('METRICS_PORT', 0))
+METRICS_INTERVAL = 60
+metrics_task = None
+
+# Rendered history embeds: (command, guild_id, args, data_version) -> render result
+RENDER_CACHE_SIZE = 256
+render_cache = OrderedDict()
+
+# Rows per page for the paginated history commands, and how long the buttons work
+STANDINGS_PAGE_SIZE = 15
+TEAM_HISTORY_PAGE_SIZE = 10
+CHAMPIONS_PAGE_SIZE = 10
+RANKINGS_PAGE_SIZE = 25
+PROJECTIONS_SHOWN = 15
+SRS_PAGE_SIZE = 20
+PAGE_TIMEOUT = 300
+
+# Largest CSV /importgames will read, and how many validation errors it lists
+IMPORT_MAX_BYTES = 5 * 1024 * 1024
+IMPORT_MAX_ERRORS = 10
+
+
+async def interaction_league(interaction):
+    """Get the league for the guild an interaction came from, loading it off the event loop."""
+    return await run_storage(get_league, interaction.guild_id)
+
+
+def response_lock(interaction):
+    """Get the lock that orders an interaction's response against an automatic defer."""
+    return interaction.extras.setdefault('response_lock', asyncio.Lock())
+
+
+async def respond(interaction, *args, **kwargs):
+    """Send the interaction response, or a followup if it was deferred, timed as a Discord REST call.
+
+    The first followup after a public defer fills in the public "thinking"
+    message whatever its ephemeral flag says, so an ephemeral reply deletes
+    that message first and goes out as a new private followup.
+    """
+    async with response_lock(interaction):
+        with metrics.timed('rest'):
+            if interaction.response.is_done():
+                if interaction.extras.pop('public_defer', False) and kwargs.get('ephemeral'):
+                    await interaction.delete_original_response()
+                await interaction.followup.send(*args, **kwargs)
+            else:
+                await interaction.response.send_message(*args, **kwargs)
 
 
-def save_teams(teams):
-    """Save registered teams to JSON file."""
-    with open(TEAMS_FILE, 'w') as f:
-        json.dump(teams, f, indent=2)
+async def defer(interaction, **kwargs):
+    """Acknowledge an interaction that will take a while, unless it already was, timed as a Discord REST call."""
+    async with response_lock(interaction):
+        if interaction.response.is_done():
+            return
+        with metrics.timed('rest'):
+            await interaction.response.defer(**kwargs)
+        if not kwargs.get('ephemeral'):
+            interaction.extras['public_defer'] = True
 
 
-def get_user_team(user_id):
+def get_user_team(league, user_id):
     """Get a user's registered team info."""
-    teams = load_teams()
-    team_name = teams.get(str(user_id))
+    team_name = league.teams.get_team(user_id)
     if team_name:
         return get_team_info(team_name)
     return None
 
 
-def load_coaching_history():
-    """Load coaching history from JSON file."""
-    if os.path.exists(COACHING_HISTORY_FILE):
-        with open(COACHING_HISTORY_FILE, 'r') as f:
-            return json.load(f)
-    return []
+async def resolve_display_names(guild, user_ids):
+    """Get display names for many members at once.
+
+    Names come from the TTL cache or the gateway member cache when possible;
+    the rest are fetched concurrently, MEMBER_FETCH_CONCURRENCY at a time.
+    Members that can't be fetched, and everyone outside a guild (DMs), fall
+    back to a mention.
+    """
+    if guild is None:
+        return {int(user_id): f"<@{user_id}>" for user_id in user_ids}
+
+    now = time.monotonic()
+    names = {}
+    misses = []
+    # The same member can be passed as an int and as a str; look each one up once
+    for user_id in dict.fromkeys(map(int, user_ids)):
+        cached = member_names.get((guild.id, user_id))
+        if cached and cached[1] > now:
+            names[user_id] = cached[0]
+            continue
+        member = guild.get_member(user_id)
+        if member:
+            member_names[(guild.id, user_id)] = (member.display_name, now + MEMBER_NAME_TTL)
+            names[user_id] = member.display_name
+        else:
+            misses.append(user_id)
+
+    if misses:
+        semaphore = asyncio.Semaphore(MEMBER_FETCH_CONCURRENCY)
+
+        async def fetch_name(user_id):
+            async with semaphore:
+                try:
+                    member = await guild.fetch_member(user_id)
+                except discord.HTTPException:
+                    return user_id, None
+            return user_id, member.display_name
+
+        with metrics.timed('rest'):
+            fetched = await asyncio.gather(*(fetch_name(u) for u in misses))
+        for user_id, display_name in fetched:
+            if display_name:
+                member_names[(guild.id, user_id)] = (display_name, time.monotonic() + MEMBER_NAME_TTL)
+                names[user_id] = display_name
+            else:
+                names[user_id] = f"<@{user_id}>"
 
+    return names
 
-def save_coaching_history(history):
-    """Save coaching history to JSON file."""
-    with open(COACHING_HISTORY_FILE, 'w') as f:
-        json.dump(history, f, indent=2)
 
+async def cached_render(command, guild_id, args, render):
+    """Get a history command's embed, rendering it only if the league's data changed.
+
+    render(guild_id, *args) returns the Embed (or an (Embed, page_count)
+    pair for paginated commands), or None when there's nothing to show.
+    Results are kept in an LRU keyed by the league's data version, so
+    saving a game or season makes every older entry unreachable. Each call
+    gets a copy of the cached embed stamped with the current time.
+    """
+    key = (command, guild_id, args, data_version(guild_id))
+    if key in render_cache:
+        render_cache.move_to_end(key)
+        result = render_cache[key]
+    else:
+        result = await render(guild_id, *args)
+        render_cache[key] = result
+        if len(render_cache) > RENDER_CACHE_SIZE:
+            render_cache.popitem(last=False)
+    return restamp(result)
+
+
+def restamp(result):
+    """Copy a cached render result with its embed's timestamp set to now."""
+    if result is None:
+        return None
+    embed, *rest = result if isinstance(result, tuple) else (result,)
+    if embed.timestamp is not None:
+        embed = embed.copy()
+        embed.timestamp = datetime.now()
+    return (embed, *rest) if rest else embed
+
+
+def page_count(total, page_size):
+    """Number of pages needed to show total rows, at least one."""
+    return max(1, -(-total // page_size))
+
+
+class Paginator(discord.ui.View):
+    """Previous/Next buttons for a paginated history command.
+
+    Each click renders just the requested page through cached_render, so
+    pages already seen are served from the render cache.
+    """
+
+    def __init__(self, interaction, command, args, render, pages):
+        super().__init__(timeout=PAGE_TIMEOUT)
+        self.interaction = interaction
+        self.command = command
+        self.args = args
+        self.render = render
+        self.page = 0
+        self.pages = pages
+        self._update_buttons()
+
+    def _update_buttons(self):
+        self.previous_page.disabled = self.page <= 0
+        self.next_page.disabled = self.page >= self.pages - 1
+
+    async def interaction_check(self, interaction: discord.Interaction) -> bool:
+        if interaction.user.id != self.interaction.user.id:
+            await respond(interaction, f"Use `/{self.command}` to browse the pages yourself.", ephemeral=True)
+            return False
+        return True
+
+    async def show(self, interaction, page):
+        timing = metrics.start_command(f'{self.command}:page')
+        try:
+            result = await cached_render(self.command, self.interaction.guild_id, self.args + (page,), self.render)
+            if result is None:
+                await respond(interaction, "Nothing to show anymore.", ephemeral=True)
+                return
+            embed, self.pages = result
+            self.page = page
+            self._update_buttons()
+            with metrics.timed('rest'):
+                await interaction.response.edit_message(embed=embed, view=self)
+        finally:
+            metrics.finish_command(timing)
+
+    @discord.ui.button(label='◀ Previous', style=discord.ButtonStyle.secondary)
+    async def previous_page(self, interaction: discord.Interaction, button: discord.ui.Button):
+        await self.show(interaction, self.page - 1)
+
+    @discord.ui.button(label='Next ▶', style=discord.ButtonStyle.secondary)
+    async def next_page(self, interaction: discord.Interaction, button: discord.ui.Button):
+        await self.show(interaction, self.page + 1)
+
+    async def on_timeout(self):
+        try:
+            await self.interaction.edit_original_response(view=None)
+        except discord.HTTPException:
+            pass
+
+
+async def respond_paginated(interaction, command, args, render, empty_message):
+    """Send the first page of a paginated history command, with buttons if there are more."""
+    result = await cached_render(command, interaction.guild_id, args + (0,), render)
+    if result is None:
+        await respond(interaction, empty_message, ephemeral=True)
+        return
+
+    embed, pages = result
+    if pages > 1:
+        await respond(interaction, embed=embed, view=Paginator(interaction, command, args, render, pages))
+    else:
+        await respond(interaction, embed=embed)
 
-def log_coaching_change(user_id, user_name, old_team, new_team):
+
+def log_coaching_change(league, user_id, user_name, old_team, new_team):
     """Log a coaching change."""
-    history = load_coaching_history()
-    history.append({
+    league.coaching.append({
         'user_id': str(user_id),
         'user_name': user_name,
         'old_team': old_team,
         'new_team': new_team,
         'date': datetime.now().isoformat()
     })
-    save_coaching_history(history)
+
+
+def command_tree_fingerprint(guild=None):
+    """Hash the names, options and descriptions of the commands in one sync scope."""
+    commands_data = []
+    for command in bot.tree.get_commands(guild=guild):
+        try:
+            commands_data.append(command.to_dict(bot.tree))
+        except TypeError:
+            # discord.py before 2.4 takes no tree argument
+            commands_data.append(command.to_dict())
+    commands_data.sort(key=lambda c: (c.get('type', 1), c['name']))
+    return hashlib.sha256(json.dumps(commands_data, sort_keys=True).encode('utf-8')).hexdigest()
+
+
+def load_command_sync_hashes():
+    """Load the last-synced hash per scope."""
+    if os.path.exists(COMMAND_SYNC_FILE):
+        with open(COMMAND_SYNC_FILE, 'r') as f:
+            return json.load(f)
+    return {}
+
+
+async def sync_command_tree():
+    """Sync the home guild and global command trees, skipping unchanged scopes.
+
+    Set FORCE_COMMAND_SYNC=1 to sync regardless of the saved hashes.
+    """
+    force = os.getenv('FORCE_COMMAND_SYNC') == '1'
+    synced_hashes = await run_storage(load_command_sync_hashes)
+
+    # Home guild first (instant for your server), then global (takes up to 1 hour)
+    scopes = [(f'{bot.application_id}:guild:{home_guild_id()}', discord.Object(id=home_guild_id())),
+              (f'{bot.application_id}:global', None)]
+    for scope, guild in scopes:
+        fingerprint = command_tree_fingerprint(guild)
+        if not force and synced_hashes.get(scope) == fingerprint:
+            print(f'Commands unchanged for {scope}, skipping sync', flush=True)
+            continue
+        try:
+            synced = await bot.tree.sync(guild=guild)
+        except Exception as e:
+            print(f'Failed to sync commands for {scope}: {e}', flush=True)
+            continue
+        print(f'Synced {len(synced)} command(s) for {scope}', flush=True)
+        synced_hashes[scope] = fingerprint
+        await run_storage(write_json_atomic, COMMAND_SYNC_FILE, synced_hashes)
+
+
+async def dump_metrics():
+    """Write the latency histograms to METRICS_FILE every METRICS_INTERVAL seconds."""
+    while True:
+        await asyncio.sleep(METRICS_INTERVAL)
+        try:
+            await run_storage(write_bytes_atomic, METRICS_FILE, metrics.render_prometheus().encode('utf-8'))
+        except OSError as e:
+            print(f'Failed to write metrics: {e}', flush=True)
 
 
 @bot.event
 async def on_ready():
+    global command_sync_task, metrics_task
     print(f'{bot.user} is online!', flush=True)
-    try:
-        # Sync to guild first (instant for your server)
-        guild = discord.Object(id=671891039765790731)
-        guild_synced = await bot.tree.sync(guild=guild)
-        print(f'Synced {len(guild_synced)} command(s) to guild', flush=True)
-
-        # Also sync globally (for other servers/devices, takes up to 1 hour)
-        global_synced = await bot.tree.sync()
-        print(f'Synced {len(global_synced)} global command(s)', flush=True)
-    except Exception as e:
-        print(f'Failed to sync commands: {e}', flush=True)
+
+    # on_ready fires again after reconnects; sync at most once per process, in the background
+    if command_sync_task is None:
+        command_sync_task = asyncio.create_task(sync_command_tree())
+    if METRICS_FILE and metrics_task is None:
+        metrics_task = asyncio.create_task(dump_metrics())
+
+
+@bot.event
+async def on_app_command_completion(interaction: discord.Interaction, command):
+    bot.tree.finish_interaction(interaction)
+
+
+@bot.event
+async def on_member_update(before, after):
+    member_names.pop((after.guild.id, after.id), None)
+
+
+@bot.event
+async def on_member_remove(member):
+    member_names.pop((member.guild.id, member.id), None)
+
+
+@bot.event
+async def on_user_update(before, after):
+    for key in [k for k in member_names if k[1] == after.id]:
+        member_names.pop(key, None)
 
 
 @bot.tree.error
 async def on_app_command_error(interaction: discord.Interaction, error: app_commands.AppCommandError):
     print(f'Command error: {error}')
     try:
-        await interaction.response.send_message(f"An error occurred: {error}", ephemeral=True)
+        await respond(interaction, f"An error occurred: {error}", ephemeral=True)
     except:
         pass
+    bot.tree.finish_interaction(interaction, error=True)
 
 
 # Autocomplete for team names
+@metrics.instrumented('autocomplete:team')
 async def team_autocomplete(interaction: discord.Interaction, current: str) -> list[app_commands.Choice[str]]:
     try:
-        teams = get_all_teams()
-        if current:
-            matches = [t for t in teams if current.lower() in t.lower()][:25]
-        else:
-            matches = teams[:25]
+        matches = search_teams(current)
         return [app_commands.Choice(name=team, value=team) for team in matches]
     except Exception as e:
         print(f"Autocomplete error: {e}")
@@ -131,29 +492,27 @@ async def register(interaction: discord.Interaction, team: str):
         matches = find_team(team)
         if matches:
             match_list = ", ".join(matches[:10])
-            await interaction.response.send_message(
+            await respond(
+                interaction,
                 f"Team '{team}' not found. Did you mean: {match_list}?",
                 ephemeral=True
             )
         else:
-            await interaction.response.send_message(
+            await respond(
+                interaction,
                 f"Team '{team}' not found. Use `/teamlist` to see available teams.",
                 ephemeral=True
             )
         return
 
-    # Check for coaching change
-    teams = load_teams()
-    old_team = teams.get(str(user.id))
+    # Save registration and check for coaching change
+    league = await interaction_league(interaction)
+    old_team = league.teams.register(user.id, team_info['name'])
     is_coaching_change = old_team and old_team != team_info['name']
 
     # Log coaching change if switching teams
     if is_coaching_change:
-        log_coaching_change(user.id, user.display_name, old_team, team_info['name'])
-
-    # Save registration
-    teams[str(user.id)] = team_info['name']
-    save_teams(teams)
+        await run_storage(log_coaching_change, league, user.id, user.display_name, old_team, team_info['name'])
 
     # Create embed with team logo
     if is_coaching_change:
@@ -176,12 +535,14 @@ async def register(interaction: discord.Interaction, team: str):
 
     embed.set_thumbnail(url=team_info['logo'])
 
-    await interaction.response.send_message(embed=embed)
+    await respond(interaction, embed=embed)
+    update_ready_board(league, interaction)
 
 
 @bot.tree.command(name='teams', description='See all registered teams')
 async def teams(interaction: discord.Interaction):
-    registered = load_teams()
+    league = await interaction_league(interaction)
+    registered = league.teams.all()
 
     embed = discord.Embed(
         title="Registered Teams",
@@ -192,21 +553,18 @@ async def teams(interaction: discord.Interaction):
     if not registered:
         embed.description = "No teams registered yet. Use `/register` to claim your team!"
     else:
+        names = await resolve_display_names(interaction.guild, registered.keys())
         team_list = []
         for user_id, team_name in registered.items():
             team_info = get_team_info(team_name)
-            try:
-                member = await interaction.guild.fetch_member(int(user_id))
-                display_name = member.display_name
-            except:
-                display_name = f"<@{user_id}>"
+            display_name = names[int(user_id)]
 
             conf = team_info['conference'] if team_info else "Unknown"
             team_list.append(f"**{display_name}**: {team_name} ({conf})")
 
         embed.description = "\n".join(team_list)
 
-    await interaction.response.send_message(embed=embed)
+    await respond(interaction, embed=embed)
 
 
 @bot.tree.command(name='teamlist', description='List all available CFB teams')
@@ -235,25 +593,138 @@ async def teamlist(interaction: discord.Interaction):
         inline=False
     )
 
-    await interaction.response.send_message(embed=embed, ephemeral=True)
+    await respond(interaction, embed=embed, ephemeral=True)
+
+
+async def build_status_embed(league, guild):
+    """Build the ready status board for a league."""
+    ready_ids = list(league.ready_players)
+    count = len(ready_ids)
+    registered = league.teams.all()
+    names = await resolve_display_names(guild, ready_ids + list(registered.keys()))
+
+    embed = discord.Embed(
+        title="Ready Status",
+        color=discord.Color.blue(),
+        timestamp=datetime.now()
+    )
+    embed.add_field(name="Ready Count", value=f"{count}/{league.player_count}", inline=False)
+
+    if ready_ids:
+        ready_list = []
+        for player_id in ready_ids:
+            team_info = get_user_team(league, player_id)
+            display_name = names.get(player_id, f"<@{player_id}>")
+
+            if team_info:
+                ready_list.append(f"✅ **{team_info['name']}** ({display_name})")
+            else:
+                ready_list.append(f"✅ {display_name}")
+
+        embed.add_field(name="Ready Players", value="\n".join(ready_list), inline=False)
+    else:
+        embed.add_field(name="Ready Players", value="No one is ready yet.", inline=False)
+
+    # Show who's NOT ready
+    not_ready = []
+    for user_id, team_name in registered.items():
+        if int(user_id) not in ready_ids:
+            not_ready.append(f"⏳ **{team_name}** ({names.get(int(user_id), f'<@{user_id}>')})")
+
+    if not_ready:
+        embed.add_field(name="Waiting On", value="\n".join(not_ready), inline=False)
+
+    return embed
+
+
+class ReadyBoard:
+    """A league's single ready status message, edited in place as the ready list changes.
+
+    Changes call schedule(), which starts one edit BOARD_DEBOUNCE seconds
+    later; further changes in that window ride along with it, so a burst
+    of /ready and /unready becomes a single message edit. The message's
+    location is saved in the league settings as ready_board.
+    """
+
+    def __init__(self, league):
+        self.league = league
+        self.lock = asyncio.Lock()
+        self.task = None
+        self.guild = None
+        self.fallback_channel = None
+
+    def schedule(self, guild, fallback_channel):
+        """Queue a board update, using fallback_channel if the league has no ready channel."""
+        self.guild = guild
+        self.fallback_channel = fallback_channel
+        if self.task is None:
+            self.task = asyncio.create_task(self._update_later())
+
+    async def _update_later(self):
+        await asyncio.sleep(BOARD_DEBOUNCE)
+        # Changes from here on queue another update instead of being missed
+        self.task = None
+        try:
+            await self.publish()
+        except discord.HTTPException as e:
+            print(f'Failed to update ready board for {self.league.guild_id}: {e}', flush=True)
+
+    async def publish(self):
+        """Edit the board message to match the ready list, posting a new one if it's gone."""
+        async with self.lock:
+            embed = await build_status_embed(self.league, self.guild)
+            location = self.league.settings.get('ready_board')
+            if location:
+                channel = bot.get_channel(location['channel_id'])
+                if channel is not None:
+                    try:
+                        await channel.get_partial_message(location['message_id']).edit(embed=embed)
+                        return
+                    except discord.NotFound:
+                        pass
+
+            channel = bot.get_channel(self.league.ready_channel_id) or self.fallback_channel
+            if channel is None:
+                return
+            message = await channel.send(embed=embed)
+            await run_storage(self.league.update_settings,
+                              ready_board={'channel_id': channel.id, 'message_id': message.id})
+
+
+def ready_board_url(league):
+    """Get a jump link to the league's ready board, or None if it hasn't been posted."""
+    location = league.settings.get('ready_board')
+    if not location:
+        return None
+    return f"https://discord.com/channels/{league.guild_id}/{location['channel_id']}/{location['message_id']}"
+
+
+def update_ready_board(league, interaction):
+    """Queue an update of the league's ready board after a change."""
+    board = ready_boards.get(league.guild_id)
+    if board is None:
+        board = ready_boards[league.guild_id] = ReadyBoard(league)
+    board.schedule(interaction.guild, interaction.channel)
+    return board
 
 
 @bot.tree.command(name='ready', description='Mark yourself as ready to advance')
 async def ready(interaction: discord.Interaction):
     user = interaction.user
+    league = await interaction_league(interaction)
 
-    if user.id in ready_players:
-        await interaction.response.send_message(
+    if not await run_storage(league.ready_players.add, user.id):
+        await respond(
+            interaction,
             f"You're already marked as ready, {user.display_name}!",
             ephemeral=True
         )
         return
 
-    ready_players.add(user.id)
-    count = len(ready_players)
+    count = len(league.ready_players)
 
     # Get user's team info
-    team_info = get_user_team(user.id)
+    team_info = get_user_team(league, user.id)
 
     # Create embed
     if team_info:
@@ -272,38 +743,41 @@ async def ready(interaction: discord.Interaction):
             timestamp=datetime.now()
         )
 
-    embed.add_field(name="Ready Count", value=f"{count}/{PLAYER_COUNT}", inline=False)
+    embed.add_field(name="Ready Count", value=f"{count}/{league.player_count}", inline=False)
 
-    await interaction.response.send_message(embed=embed)
+    await respond(interaction, embed=embed, ephemeral=True)
+    update_ready_board(league, interaction)
 
-    # Check if everyone is ready
-    if count >= PLAYER_COUNT:
-        channel = bot.get_channel(READY_CHANNEL_ID) or interaction.channel
+    # Ping once per week when everyone is ready
+    if count >= league.player_count and await run_storage(league.ready_players.mark_pinged):
+        channel = bot.get_channel(league.ready_channel_id) or interaction.channel
 
         all_ready_embed = discord.Embed(
             title="Everyone is Ready!",
             description="All players are ready to advance! Time to move to the next week!",
             color=discord.Color.gold()
         )
-        await channel.send("@here", embed=all_ready_embed)
+        with metrics.timed('rest'):
+            await channel.send("@here", embed=all_ready_embed)
 
 
 @bot.tree.command(name='unready', description='Remove yourself from the ready list')
 async def unready(interaction: discord.Interaction):
     user = interaction.user
+    league = await interaction_league(interaction)
 
-    if user.id not in ready_players:
-        await interaction.response.send_message(
+    if not await run_storage(league.ready_players.discard, user.id):
+        await respond(
+            interaction,
             f"You weren't marked as ready, {user.display_name}.",
             ephemeral=True
         )
         return
 
-    ready_players.discard(user.id)
-    count = len(ready_players)
+    count = len(league.ready_players)
 
     # Get user's team info
-    team_info = get_user_team(user.id)
+    team_info = get_user_team(league, user.id)
 
     if team_info:
         embed = discord.Embed(
@@ -321,63 +795,27 @@ async def unready(interaction: discord.Interaction):
             timestamp=datetime.now()
         )
 
-    embed.add_field(name="Ready Count", value=f"{count}/{PLAYER_COUNT}", inline=False)
+    embed.add_field(name="Ready Count", value=f"{count}/{league.player_count}", inline=False)
 
-    await interaction.response.send_message(embed=embed)
+    await respond(interaction, embed=embed, ephemeral=True)
+    update_ready_board(league, interaction)
 
 
 @bot.tree.command(name='status', description='Check who is ready to advance')
 async def status(interaction: discord.Interaction):
-    count = len(ready_players)
+    league = await interaction_league(interaction)
+    embed = await build_status_embed(league, interaction.guild)
 
-    embed = discord.Embed(
-        title="Ready Status",
-        color=discord.Color.blue(),
-        timestamp=datetime.now()
-    )
-    embed.add_field(name="Ready Count", value=f"{count}/{PLAYER_COUNT}", inline=False)
+    jump_url = ready_board_url(league)
+    content = f"Live board: {jump_url}" if jump_url else None
 
-    if ready_players:
-        ready_list = []
-        for player_id in ready_players:
-            team_info = get_user_team(player_id)
-            try:
-                member = await interaction.guild.fetch_member(player_id)
-                display_name = member.display_name
-            except:
-                display_name = f"<@{player_id}>"
-
-            if team_info:
-                ready_list.append(f"✅ **{team_info['name']}** ({display_name})")
-            else:
-                ready_list.append(f"✅ {display_name}")
-
-        embed.add_field(name="Ready Players", value="\n".join(ready_list), inline=False)
-    else:
-        embed.add_field(name="Ready Players", value="No one is ready yet.", inline=False)
-
-    # Show who's NOT ready
-    registered = load_teams()
-    not_ready = []
-    for user_id, team_name in registered.items():
-        if int(user_id) not in ready_players:
-            try:
-                member = await interaction.guild.fetch_member(int(user_id))
-                display_name = member.display_name
-            except:
-                display_name = f"<@{user_id}>"
-            not_ready.append(f"⏳ **{team_name}** ({display_name})")
-
-    if not_ready:
-        embed.add_field(name="Waiting On", value="\n".join(not_ready), inline=False)
-
-    await interaction.response.send_message(embed=embed)
+    await respond(interaction, content, embed=embed, ephemeral=True)
 
 
 @bot.tree.command(name='advance', description='Clear all ready status (use after advancing)')
 async def advance(interaction: discord.Interaction):
-    count = len(ready_players)
-    ready_players.clear()
+    league = await interaction_league(interaction)
+    count = await run_storage(league.ready_players.clear)
 
     embed = discord.Embed(
         title="Week Advanced!",
@@ -386,15 +824,17 @@ async def advance(interaction: discord.Interaction):
         timestamp=datetime.now()
     )
 
-    await interaction.response.send_message(embed=embed)
+    await respond(interaction, embed=embed)
+    update_ready_board(league, interaction)
 
 
 @bot.tree.command(name='coachinghistory', description='View coaching changes/carousel')
 async def coachinghistory(interaction: discord.Interaction):
-    history = load_coaching_history()
+    league = await interaction_league(interaction)
+    history = await run_storage(league.coaching.tail, 10)
 
     if not history:
-        await interaction.response.send_message("No coaching changes recorded yet!", ephemeral=True)
+        await respond(interaction, "No coaching changes recorded yet!", ephemeral=True)
         return
 
     embed = discord.Embed(
@@ -405,7 +845,7 @@ async def coachinghistory(interaction: discord.Interaction):
     )
 
     # Show most recent changes first
-    for change in reversed(history[-10:]):
+    for change in reversed(history):
         date = change['date'][:10]  # Just the date part
         embed.add_field(
             name=f"{change['user_name']} ({date})",
@@ -413,7 +853,69 @@ async def coachinghistory(interaction: discord.Interaction):
             inline=False
         )
 
-    await interaction.response.send_message(embed=embed)
+    await respond(interaction, embed=embed)
+
+
+@bot.tree.command(name='leaguesettings', description='View or change this server\'s league settings')
+@app_commands.describe(
+    player_count='Number of players in the league',
+    ready_channel='Channel for the ready board and the everyone-is-ready ping'
+)
+@app_commands.default_permissions(manage_guild=True)
+async def leaguesettings(interaction: discord.Interaction, player_count: app_commands.Range[int, 1] = None,
+                         ready_channel: discord.TextChannel = None):
+    league = await interaction_league(interaction)
+
+    changes = {}
+    if player_count is not None:
+        changes['player_count'] = player_count
+    if ready_channel is not None and ready_channel.id != league.ready_channel_id:
+        changes['ready_channel_id'] = ready_channel.id
+        # Post a fresh board in the new channel
+        changes['ready_board'] = None
+    if changes:
+        await run_storage(league.update_settings, **changes)
+
+    channel_id = league.ready_channel_id
+    embed = discord.Embed(
+        title="League Settings Updated" if changes else "League Settings",
+        color=discord.Color.blue(),
+        timestamp=datetime.now()
+    )
+    embed.add_field(name="Players", value=league.player_count, inline=True)
+    embed.add_field(name="Ready Channel", value=f"<#{channel_id}>" if channel_id else "Channel of the last /ready", inline=True)
+
+    await respond(interaction, embed=embed, ephemeral=True)
+    if changes:
+        update_ready_board(league, interaction)
+
+
+@bot.tree.command(name='botstats', description='View command latency stats')
+@app_commands.default_permissions(manage_guild=True)
+async def botstats(interaction: discord.Interaction):
+    summaries = metrics.command_summaries()
+
+    embed = discord.Embed(
+        title="Bot Stats",
+        description=f"Latency per command since startup, across {len(bot.guilds)} server(s).",
+        color=discord.Color.blue(),
+        timestamp=datetime.now()
+    )
+
+    if not summaries:
+        embed.description = "No commands timed yet."
+    for summary in summaries[:20]:
+        name = summary['command'] if summary['command'].startswith('autocomplete:') else f"/{summary['command']}"
+        errors = f" | {summary['errors']} error(s)" if summary['errors'] else ""
+        embed.add_field(
+            name=f"{name} ({summary['calls']} call(s){errors})",
+            value=f"p50 ≤ {summary['p50_ms']:g}ms | p95 ≤ {summary['p95_ms']:g}ms\n"
+                  f"avg: storage {summary['mean_storage_ms']:.1f}ms, "
+                  f"REST {summary['mean_rest_ms']:.1f}ms, compute {summary['mean_compute_ms']:.1f}ms",
+            inline=False
+        )
+
+    await respond(interaction, embed=embed, ephemeral=True)
 
 
 # ============ HISTORY COMMANDS ============
@@ -430,7 +932,7 @@ async def coachinghistory(interaction: discord.Interaction):
 @app_commands.autocomplete(team1=team_autocomplete, team2=team_autocomplete)
 async def loggame(interaction: discord.Interaction, season: int, week: int,
                   team1: str, score1: int, team2: str, score2: int):
-    save_game(season, week, team1, team2, score1, score2)
+    await run_storage(save_game, season, week, team1, team2, score1, score2, guild_id=interaction.guild_id)
 
     winner = team1 if score1 > score2 else team2
     winner_info = get_team_info(winner)
@@ -448,23 +950,103 @@ async def loggame(interaction: discord.Interaction, season: int, week: int,
     if winner_info:
         embed.set_thumbnail(url=winner_info['logo'])
 
-    await interaction.response.send_message(embed=embed)
+    await respond(interaction, embed=embed)
 
 
-@bot.tree.command(name='standings', description='View standings')
-@app_commands.describe(season='Season year (leave empty for all-time)')
-async def standings(interaction: discord.Interaction, season: int = None):
-    records = get_standings(season)
+@bot.tree.command(name='importgames', description='Import game results from a CSV file')
+@app_commands.describe(file='CSV with the columns season,week,team1,team2,score1,score2')
+@app_commands.default_permissions(manage_guild=True)
+async def importgames(interaction: discord.Interaction, file: discord.Attachment):
+    if file.size > IMPORT_MAX_BYTES:
+        await respond(interaction, f"That file is too big. Split it into files under {IMPORT_MAX_BYTES // (1024 * 1024)} MB.",
+                      ephemeral=True)
+        return
 
-    if not records:
-        await interaction.response.send_message("No games logged yet!", ephemeral=True)
+    await defer(interaction, thinking=True)
+    with metrics.timed('rest'):
+        data = await file.read()
+    try:
+        text = data.decode('utf-8-sig')
+    except UnicodeDecodeError:
+        await respond(interaction, "That file isn't a UTF-8 CSV.")
+        return
+
+    # Validate everything first so a bad row imports nothing
+    games, errors = await run_storage(parse_games_csv, text)
+    if errors:
+        error_list = "\n".join(errors[:IMPORT_MAX_ERRORS])
+        more = f"\n...and {len(errors) - IMPORT_MAX_ERRORS} more" if len(errors) > IMPORT_MAX_ERRORS else ""
+        await respond(interaction, f"Nothing was imported. Fix these rows and try again:\n{error_list}{more}")
+        return
+    if not games:
+        await respond(interaction, "No games found in that file.")
         return
 
+    await run_storage(save_games, games, guild_id=interaction.guild_id)
+
+    seasons = sorted({game['season'] for game in games})
+    teams = {game['team1'] for game in games} | {game['team2'] for game in games}
+    embed = discord.Embed(
+        title="Games Imported!",
+        description=f"**{len(games)}** game(s) added from `{file.filename}`.",
+        color=discord.Color.green(),
+        timestamp=datetime.now()
+    )
+    embed.add_field(name="Seasons", value=f"{seasons[0]}–{seasons[-1]}" if len(seasons) > 1 else seasons[0], inline=True)
+    embed.add_field(name="Teams", value=len(teams), inline=True)
+
+    await respond(interaction, embed=embed)
+
+
+def gzip_file(path):
+    """Compress a file next to itself and return the .gz path."""
+    gz_path = path + '.gz'
+    with open(path, 'rb') as src, gzip.open(gz_path, 'wb') as dst:
+        shutil.copyfileobj(src, dst)
+    return gz_path
+
+
+@bot.tree.command(name='exportgames', description='Download the game history as a CSV file')
+async def exportgames(interaction: discord.Interaction):
+    await defer(interaction, thinking=True)
+
+    fd, path = tempfile.mkstemp(prefix='game_history_', suffix='.csv')
+    os.close(fd)
+    paths = [path]
+    try:
+        count = await run_storage(export_games, path, guild_id=interaction.guild_id)
+        if not count:
+            await respond(interaction, "No games logged yet!")
+            return
+
+        # Compress exports too big to attach as plain CSV
+        limit = interaction.guild.filesize_limit if interaction.guild else 10 * 1024 * 1024
+        filename = 'game_history.csv'
+        if os.path.getsize(path) > limit:
+            path = await run_storage(gzip_file, path)
+            paths.append(path)
+            filename += '.gz'
+        if os.path.getsize(path) > limit:
+            await respond(interaction, f"The history ({count} games) is too big to attach here, even compressed.")
+            return
+
+        await respond(interaction, f"Exported {count} game(s).", file=discord.File(path, filename=filename))
+    finally:
+        for p in paths:
+            os.remove(p)
+
+
+async def render_standings(guild_id, season, page):
+    offset = page * STANDINGS_PAGE_SIZE
+    records, total = await run_storage(get_standings_page, season, offset, STANDINGS_PAGE_SIZE, guild_id=guild_id)
+    if not total:
+        return None
+
     title = f"{season} Standings" if season else "All-Time Standings"
     embed = discord.Embed(title=title, color=discord.Color.blue(), timestamp=datetime.now())
 
     standings_text = []
-    for i, (team, record) in enumerate(records[:15], 1):
+    for i, (team, record) in enumerate(records, offset + 1):
         pf, pa = record['points_for'], record['points_against']
         diff = pf - pa
         diff_str = f"+{diff}" if diff > 0 else str(diff)
@@ -472,21 +1054,22 @@ async def standings(interaction: discord.Interaction, season: int = None):
             f"**{i}. {team}** ({record['wins']}-{record['losses']}) | PF: {pf} | PA: {pa} | {diff_str}"
         )
 
+    pages = page_count(total, STANDINGS_PAGE_SIZE)
     embed.description = "\n".join(standings_text)
-    await interaction.response.send_message(embed=embed)
+    embed.set_footer(text=f"Page {page + 1} of {pages} · {total} teams")
+    return embed, pages
 
 
-@bot.tree.command(name='h2h', description='Head-to-head record between two teams')
-@app_commands.describe(team1='First team', team2='Second team')
-@app_commands.autocomplete(team1=team_autocomplete, team2=team_autocomplete)
-async def h2h(interaction: discord.Interaction, team1: str, team2: str):
-    results = get_head_to_head(team1, team2)
+@bot.tree.command(name='standings', description='View standings')
+@app_commands.describe(season='Season year (leave empty for all-time)')
+async def standings(interaction: discord.Interaction, season: int = None):
+    await respond_paginated(interaction, 'standings', (season,), render_standings, "No games logged yet!")
 
+
+async def render_h2h(guild_id, team1, team2):
+    results = await run_storage(get_head_to_head, team1, team2, guild_id=guild_id)
     if not results['games']:
-        await interaction.response.send_message(
-            f"No games found between {team1} and {team2}.", ephemeral=True
-        )
-        return
+        return None
 
     embed = discord.Embed(
         title=f"{team1} vs {team2}",
@@ -507,26 +1090,36 @@ async def h2h(interaction: discord.Interaction, team1: str, team2: str):
     if games_text:
         embed.add_field(name="Recent Games", value="\n".join(games_text), inline=False)
 
-    await interaction.response.send_message(embed=embed)
+    return embed
 
 
-@bot.tree.command(name='teamhistory', description='View a team\'s game history')
-@app_commands.describe(team='Team name')
-@app_commands.autocomplete(team=team_autocomplete)
-async def teamhistory(interaction: discord.Interaction, team: str):
-    games = get_team_history(team)
-    team_info = get_team_info(team)
+@bot.tree.command(name='h2h', description='Head-to-head record between two teams')
+@app_commands.describe(team1='First team', team2='Second team')
+@app_commands.autocomplete(team1=team_autocomplete, team2=team_autocomplete)
+async def h2h(interaction: discord.Interaction, team1: str, team2: str):
+    embed = await cached_render('h2h', interaction.guild_id, (team1, team2), render_h2h)
 
-    if not games:
-        await interaction.response.send_message(f"No games found for {team}.", ephemeral=True)
+    if embed is None:
+        await respond(
+            interaction,
+            f"No games found between {team1} and {team2}.", ephemeral=True
+        )
         return
 
-    wins = sum(1 for g in games if g['result'] == 'W')
-    losses = len(games) - wins
+    await respond(interaction, embed=embed)
+
+
+async def render_teamhistory(guild_id, team, page):
+    offset = page * TEAM_HISTORY_PAGE_SIZE
+    results = await run_storage(get_team_history_page, team, offset, TEAM_HISTORY_PAGE_SIZE, guild_id=guild_id)
+    if not results['total']:
+        return None
+
+    team_info = get_team_info(team)
 
     embed = discord.Embed(
         title=f"{team} History",
-        description=f"**Record: {wins}-{losses}**",
+        description=f"**Record: {results['wins']}-{results['losses']}**",
         color=discord.Color.blue(),
         timestamp=datetime.now()
     )
@@ -534,15 +1127,23 @@ async def teamhistory(interaction: discord.Interaction, team: str):
     if team_info:
         embed.set_thumbnail(url=team_info['logo'])
 
-    # Show recent games
+    # Most recent games first page, older games on later pages
     games_text = []
-    for game in games[-10:]:  # Last 10 games
+    for game in results['games']:
         emoji = "✅" if game['result'] == 'W' else "❌"
         games_text.append(f"{emoji} S{game['season']} W{game['week']}: vs {game['opponent']} ({game['score']})")
 
-    embed.add_field(name="Recent Games", value="\n".join(games_text), inline=False)
+    pages = page_count(results['total'], TEAM_HISTORY_PAGE_SIZE)
+    embed.add_field(name="Recent Games" if page == 0 else "Earlier Games", value="\n".join(games_text), inline=False)
+    embed.set_footer(text=f"Page {page + 1} of {pages} · {results['total']} games")
+    return embed, pages
 
-    await interaction.response.send_message(embed=embed)
+
+@bot.tree.command(name='teamhistory', description='View a team\'s game history')
+@app_commands.describe(team='Team name')
+@app_commands.autocomplete(team=team_autocomplete)
+async def teamhistory(interaction: discord.Interaction, team: str):
+    await respond_paginated(interaction, 'teamhistory', (team,), render_teamhistory, f"No games found for {team}.")
 
 
 @bot.tree.command(name='logseason', description='Log a season championship')
@@ -556,7 +1157,8 @@ async def teamhistory(interaction: discord.Interaction, team: str):
 @app_commands.autocomplete(champion=team_autocomplete, runner_up=team_autocomplete, heisman_team=team_autocomplete)
 async def logseason(interaction: discord.Interaction, season: int, champion: str,
                     runner_up: str, heisman: str, heisman_team: str):
-    save_season(season, champion, runner_up, heisman, heisman_team)
+    await run_storage(save_season, season, champion, runner_up, heisman, heisman_team,
+                      guild_id=interaction.guild_id)
 
     champ_info = get_team_info(champion)
 
@@ -572,31 +1174,146 @@ async def logseason(interaction: discord.Interaction, season: int, champion: str
     if champ_info:
         embed.set_thumbnail(url=champ_info['logo'])
 
-    await interaction.response.send_message(embed=embed)
+    await respond(interaction, embed=embed)
 
 
-@bot.tree.command(name='champions', description='View championship history')
-async def champions(interaction: discord.Interaction):
-    history = get_championships()
+async def render_rankings(guild_id, page):
+    rankings = await run_storage(get_rankings, guild_id)
+    if not rankings:
+        return None
 
-    if not history:
-        await interaction.response.send_message("No championship history logged yet!", ephemeral=True)
+    offset = page * RANKINGS_PAGE_SIZE
+    embed = discord.Embed(
+        title="📈 Power Rankings",
+        description="\n".join(
+            f"**{i}. {team}** {info['rating']:.0f} ({info['games']} games)"
+            for i, (team, info) in enumerate(rankings[offset:offset + RANKINGS_PAGE_SIZE], offset + 1)
+        ),
+        color=discord.Color.blue(),
+        timestamp=datetime.now()
+    )
+
+    pages = page_count(len(rankings), RANKINGS_PAGE_SIZE)
+    embed.set_footer(text=f"Page {page + 1} of {pages} · Elo ratings, adjusted for margin of victory")
+    return embed, pages
+
+
+@bot.tree.command(name='rankings', description='View Elo power rankings')
+async def rankings(interaction: discord.Interaction):
+    await respond_paginated(interaction, 'rankings', (), render_rankings, "No games logged yet!")
+
+
+async def render_srs(guild_id, season, page):
+    team_metrics = await run_storage(get_team_metrics, season, guild_id)
+    if not team_metrics:
+        return None
+
+    offset = page * SRS_PAGE_SIZE
+    lines = []
+    for i, (team, m) in enumerate(team_metrics[offset:offset + SRS_PAGE_SIZE], offset + 1):
+        lines.append(f"**{i}. {team}** SRS {m['srs']:+.1f} | MOV {m['mov']:+.1f} | SOS {m['sos']:+.1f}")
+
+    embed = discord.Embed(
+        title=f"{season} Team Ratings" if season else "All-Time Team Ratings",
+        description="\n".join(lines),
+        color=discord.Color.blue(),
+        timestamp=datetime.now()
+    )
+    pages = page_count(len(team_metrics), SRS_PAGE_SIZE)
+    embed.set_footer(text=f"Page {page + 1} of {pages} · SRS = points better than an average team "
+                          f"(MOV + SOS), margins capped at {MARGIN_CAP}")
+    return embed, pages
+
+
+@bot.tree.command(name='srs', description='View margin-adjusted team ratings and strength of schedule')
+@app_commands.describe(season='Season year (leave empty for all-time)')
+async def srs(interaction: discord.Interaction, season: int = None):
+    await respond_paginated(interaction, 'srs', (season,), render_srs, "No games logged yet!")
+
+
+async def render_projections(guild_id, season, simulations, weeks, playoff_teams):
+    result = await project_season(season, simulations, weeks, playoff_teams, guild_id=guild_id)
+    if result is None:
+        return None
+
+    if result['weeks_left']:
+        simulated = f"weeks {result['first_week']}–{weeks} and a {playoff_teams}-team playoff"
+    else:
+        simulated = f"the {playoff_teams}-team playoff"
+    embed = discord.Embed(
+        title=f"🔮 {result['season']} Projections",
+        description=f"{simulations:,} simulations of {simulated}, from the current power ratings.",
+        color=discord.Color.purple(),
+        timestamp=datetime.now()
+    )
+
+    lines = []
+    for i, projection in enumerate(result['projections'][:PROJECTIONS_SHOWN], 1):
+        lines.append(
+            f"**{i}. {projection['team']}** {projection['mean_wins']:.1f} wins "
+            f"({projection['wins_low']}–{projection['wins_high']}) | "
+            f"Playoff {projection['playoff_odds']:.0%} | Title {projection['title_odds']:.1%}"
+        )
+    embed.add_field(name="Title Odds", value="\n".join(lines), inline=False)
+    embed.set_footer(text="Win range is the 10th to 90th percentile. Remaining opponents are drawn at random.")
+    return embed
+
+
+@bot.tree.command(name='projections', description='Simulate the rest of the season and the playoff')
+@app_commands.describe(
+    season='Season year (leave empty for the latest)',
+    simulations=f'Number of simulated seasons (default {DEFAULT_SIMULATIONS:,})',
+    weeks=f'Weeks in the regular season (default {REGULAR_SEASON_WEEKS})',
+    playoff_teams=f'Teams in the playoff (default {PLAYOFF_TEAMS})'
+)
+@app_commands.choices(playoff_teams=[app_commands.Choice(name=str(n), value=n) for n in (2, 4, 8, 16)])
+async def projections(interaction: discord.Interaction, season: int = None,
+                      simulations: app_commands.Range[int, 100, MAX_SIMULATIONS] = DEFAULT_SIMULATIONS,
+                      weeks: app_commands.Range[int, 1, 20] = REGULAR_SEASON_WEEKS,
+                      playoff_teams: int = PLAYOFF_TEAMS):
+    await defer(interaction, thinking=True)
+
+    try:
+        embed = await cached_render('projections', interaction.guild_id,
+                                    (season, simulations, weeks, playoff_teams), render_projections)
+    except ValueError as e:
+        await respond(interaction, str(e))
         return
 
+    if embed is None:
+        await respond(interaction, "No games logged for that season yet!")
+        return
+
+    await respond(interaction, embed=embed)
+
+
+async def render_champions(guild_id, page):
+    offset = page * CHAMPIONS_PAGE_SIZE
+    history, total = await run_storage(get_championships_page, offset, CHAMPIONS_PAGE_SIZE, guild_id=guild_id)
+    if not total:
+        return None
+
     embed = discord.Embed(
         title="🏆 Championship History",
         color=discord.Color.gold(),
         timestamp=datetime.now()
     )
 
-    for season in history[:10]:  # Last 10 seasons
+    for season in history:
         embed.add_field(
             name=f"{season['season']} Season",
             value=f"**Champion:** {season['champion']}\n**Runner-Up:** {season['runner_up']}\n**Heisman:** {season['heisman']} ({season['heisman_team']})",
             inline=False
         )
 
-    await interaction.response.send_message(embed=embed)
+    pages = page_count(total, CHAMPIONS_PAGE_SIZE)
+    embed.set_footer(text=f"Page {page + 1} of {pages} · {total} seasons")
+    return embed, pages
+
+
+@bot.tree.command(name='champions', description='View championship history')
+async def champions(interaction: discord.Interaction):
+    await respond_paginated(interaction, 'champions', (), render_champions, "No championship history logged yet!")
 
 
 # Run the bot
@@ -604,4 +1321,7 @@ if __name__ == '__main__':
     if not TOKEN:
         print("ERROR: No Discord token found. Create a .env file with DISCORD_TOKEN=your_token")
     else:
+        load_store()
+        if METRICS_PORT:
+            metrics.serve_metrics(METRICS_PORT)
         bot.run(TOKEN)
@@ -141,33 +141,175 @@ CFB_TEAMS = {
     "UMass": {"id": 113, "conference": "Independent"},
 }
 
+# Common abbreviations and nicknames, matched by team search
+TEAM_ALIASES = {
+    "bama": ["Alabama"],
+    "uga": ["Georgia"],
+    "uk": ["Kentucky"],
+    "mizzou": ["Missouri"],
+    "ou": ["Oklahoma"],
+    "sc": ["South Carolina"],
+    "ut": ["Tennessee", "Texas"],
+    "tamu": ["Texas A&M"],
+    "osu": ["Ohio State", "Oklahoma State"],
+    "tosu": ["Ohio State"],
+    "msu": ["Michigan State", "Mississippi State"],
+    "umich": ["Michigan"],
+    "psu": ["Penn State"],
+    "minny": ["Minnesota"],
+    "wisco": ["Wisconsin"],
+    "fsu": ["Florida State"],
+    "uf": ["Florida"],
+    "unc": ["North Carolina"],
+    "ncsu": ["NC State"],
+    "gt": ["Georgia Tech"],
+    "vt": ["Virginia Tech"],
+    "uva": ["Virginia"],
+    "bc": ["Boston College"],
+    "cuse": ["Syracuse"],
+    "pitt": ["Pittsburgh"],
+    "cal": ["California"],
+    "asu": ["Arizona State"],
+    "isu": ["Iowa State"],
+    "ksu": ["Kansas State"],
+    "ttu": ["Texas Tech"],
+    "wvu": ["West Virginia"],
+    "uh": ["Houston"],
+    "nd": ["Notre Dame"],
+    "app state": ["Appalachian State"],
+    "bsu": ["Boise State"],
+    "csu": ["Colorado State"],
+    "usu": ["Utah State"],
+    "sdsu": ["San Diego State"],
+    "sjsu": ["San Jose State"],
+    "nmsu": ["New Mexico State"],
+    "usf": ["South Florida"],
+    "usm": ["Southern Miss"],
+    "ecu": ["East Carolina"],
+    "unt": ["North Texas"],
+    "wku": ["Western Kentucky"],
+    "mtsu": ["Middle Tennessee"],
+    "jmu": ["James Madison"],
+    "ccu": ["Coastal Carolina"],
+    "la tech": ["Louisiana Tech"],
+}
+
+LOGO_URL = "https://a.espncdn.com/i/teamlogos/ncaa/500/{id}.png"
+
+class TeamRecord:
+    """Read-only team info, built once per team and shared by every lookup.
+
+    Fields can be read as attributes or with record['name'] style access.
+    """
+    __slots__ = ('name', 'id', 'conference', 'logo')
+
+    def __init__(self, name, team_id, conference):
+        object.__setattr__(self, 'name', name)
+        object.__setattr__(self, 'id', team_id)
+        object.__setattr__(self, 'conference', conference)
+        object.__setattr__(self, 'logo', LOGO_URL.format(id=team_id))
+
+    def __setattr__(self, key, value):
+        raise AttributeError("TeamRecord is read-only")
+
+    def __delattr__(self, key):
+        raise AttributeError("TeamRecord is read-only")
+
+    def __getitem__(self, key):
+        if key not in self.__slots__:
+            raise KeyError(key)
+        return getattr(self, key)
+
+    def __repr__(self):
+        return f"TeamRecord(name={self.name!r}, id={self.id}, conference={self.conference!r})"
+
+TEAM_RECORDS = {
+    name: TeamRecord(name, team["id"], team["conference"])
+    for name, team in CFB_TEAMS.items()
+}
+_SORTED_TEAMS = tuple(sorted(CFB_TEAMS.keys()))
+
+def _group_by_conference():
+    """Group the sorted team names by conference."""
+    groups = {}
+    for name in _SORTED_TEAMS:
+        groups.setdefault(CFB_TEAMS[name]["conference"], []).append(name)
+    return {conference: tuple(names) for conference, names in groups.items()}
+
+TEAMS_BY_CONFERENCE = _group_by_conference()
+
 def get_team_logo(team_name):
     """Get the ESPN logo URL for a team."""
-    team = CFB_TEAMS.get(team_name)
+    team = TEAM_RECORDS.get(team_name)
     if team:
-        return f"https://a.espncdn.com/i/teamlogos/ncaa/500/{team['id']}.png"
+        return team.logo
     return None
 
 def get_team_info(team_name):
     """Get team info including logo URL."""
-    team = CFB_TEAMS.get(team_name)
-    if team:
-        return {
-            "name": team_name,
-            "logo": f"https://a.espncdn.com/i/teamlogos/ncaa/500/{team['id']}.png",
-            "conference": team["conference"]
-        }
-    return None
+    return TEAM_RECORDS.get(team_name)
 
 def find_team(search_term):
     """Find a team by partial name match (case insensitive)."""
-    search_lower = search_term.lower()
-    matches = []
-    for team_name in CFB_TEAMS.keys():
-        if search_lower in team_name.lower():
-            matches.append(team_name)
-    return matches
+    return search_teams(search_term, limit=None)
 
 def get_all_teams():
     """Get list of all team names."""
-    return sorted(CFB_TEAMS.keys())
+    return _SORTED_TEAMS
+
+def get_conference_teams(conference):
+    """Get the sorted team names in a conference."""
+    return TEAMS_BY_CONFERENCE.get(conference, ())
+
+def _build_search_index():
+    """Build the lookup tables used by search_teams.
+
+    Every team name and alias is lowercased once and every substring of up
+    to three characters is mapped to the keys containing it, so a query
+    only has to check keys that share its n-grams.
+    """
+    keys = [(name.lower(), name) for name in CFB_TEAMS]
+    keys += [(alias, name) for alias, names in TEAM_ALIASES.items() for name in names if name in CFB_TEAMS]
+
+    ngrams = {}
+    for index, (key, _) in enumerate(keys):
+        for size in range(1, 4):
+            for start in range(len(key) - size + 1):
+                ngrams.setdefault(key[start:start + size], set()).add(index)
+    return keys, ngrams
+
+_SEARCH_KEYS, _SEARCH_NGRAMS = _build_search_index()
+
+def search_teams(query, limit=25):
+    """Search team names and aliases, best matches first.
+
+    Exact matches rank first, then prefix matches, then matches at the start
+    of a later word, then any other substring match.
+    """
+    query = query.strip().lower()
+    if not query:
+        return list(_SORTED_TEAMS[:limit])
+
+    if len(query) <= 3:
+        candidates = _SEARCH_NGRAMS.get(query, set())
+    else:
+        grams = [query[i:i + 3] for i in range(len(query) - 2)]
+        candidates = set.intersection(*(_SEARCH_NGRAMS.get(g, set()) for g in grams))
+
+    best = {}
+    for index in candidates:
+        key, team_name = _SEARCH_KEYS[index]
+        if query not in key:
+            continue
+        if key == query:
+            rank = 0
+        elif key.startswith(query):
+            rank = 1
+        elif f" {query}" in key:
+            rank = 2
+        else:
+            rank = 3
+        if rank < best.get(team_name, 4):
+            best[team_name] = rank
+
+    return sorted(best, key=lambda name: (best[name], name))[:limit]
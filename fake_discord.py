@@ -0,0 +1,280 @@
+"""Offline stand-ins for the Discord objects the bot's commands touch.
+
+A FakeInteraction carries a fake user, guild, channel, response and
+followup, and invoke() runs a bot.tree command callback with it the way
+discord.py would: through the tree's interaction check (which starts the
+command's latency timing), then the callback, then the completion or
+error handling, including the tree's automatic defer and budget
+cancellation. Nothing talks to Discord; every REST call sleeps for
+rest_latency seconds and is recorded on the fake object instead.
+"""
+import asyncio
+import itertools
+import random
+import time
+
+import discord
+from discord import app_commands
+
+# Discord drops interactions that aren't acknowledged within this many seconds
+INTERACTION_DEADLINE = 3.0
+
+_snowflakes = itertools.count(1_000_000_000_000_000)
+
+
+def next_id():
+    """Get a new fake snowflake ID."""
+    return next(_snowflakes)
+
+
+class FakeHTTPResponse:
+    """Just enough of an aiohttp response to build discord.HTTPException subclasses."""
+
+    def __init__(self, status, reason):
+        self.status = status
+        self.reason = reason
+
+
+class FakeREST:
+    """Simulated Discord REST latency, shared by every fake object of one run."""
+
+    def __init__(self, latency=0.0, jitter=0.0, seed=0):
+        self.latency = latency
+        self.jitter = jitter
+        self.rng = random.Random(seed)
+        self.calls = 0
+
+    async def call(self):
+        self.calls += 1
+        delay = self.latency + self.rng.uniform(0, self.jitter) if self.jitter else self.latency
+        await asyncio.sleep(delay)
+
+
+class FakeUser:
+    def __init__(self, user_id=None, name=None, guild=None):
+        self.id = user_id or next_id()
+        self.name = name or f'user{self.id % 100000}'
+        self.display_name = self.name
+        self.mention = f'<@{self.id}>'
+        self.bot = False
+        self.guild = guild
+
+
+class FakeMessage:
+    def __init__(self, channel, content=None, embed=None, view=None, message_id=None):
+        self.id = message_id or next_id()
+        self.channel = channel
+        self.content = content
+        self.embed = embed
+        self.view = view
+        self.edits = 0
+
+    async def edit(self, content=None, embed=None, view=None, **kwargs):
+        await self.channel.rest.call()
+        if content is not None:
+            self.content = content
+        if embed is not None:
+            self.embed = embed
+        self.view = view
+        self.edits += 1
+        return self
+
+
+class FakePartialMessage:
+    """A message referenced by ID only, as channel.get_partial_message returns."""
+
+    def __init__(self, channel, message_id):
+        self.channel = channel
+        self.id = message_id
+
+    async def edit(self, **kwargs):
+        message = self.channel.messages.get(self.id)
+        if message is None:
+            await self.channel.rest.call()
+            raise discord.NotFound(FakeHTTPResponse(404, 'Not Found'), 'Unknown Message')
+        return await message.edit(**kwargs)
+
+
+class FakeChannel:
+    def __init__(self, guild=None, name='general', rest=None, channel_id=None):
+        self.id = channel_id or next_id()
+        self.guild = guild
+        self.name = name
+        self.mention = f'<#{self.id}>'
+        self.rest = rest or FakeREST()
+        self.messages = {}
+
+    async def send(self, content=None, embed=None, view=None, **kwargs):
+        await self.rest.call()
+        message = FakeMessage(self, content, embed, view)
+        self.messages[message.id] = message
+        return message
+
+    def get_partial_message(self, message_id):
+        return FakePartialMessage(self, message_id)
+
+
+class FakeGuild:
+    """A guild whose members are all in the member cache, unless cache_members is False."""
+
+    def __init__(self, guild_id=None, member_count=0, rest=None, cache_members=True):
+        self.id = guild_id or next_id()
+        self.name = f'guild{self.id % 100000}'
+        self.rest = rest or FakeREST()
+        self.filesize_limit = 10 * 1024 * 1024
+        self.cache_members = cache_members
+        self.members = {}
+        self.channels = {}
+        for _ in range(member_count):
+            self.add_member()
+
+    def add_member(self, name=None):
+        member = FakeUser(name=name, guild=self)
+        self.members[member.id] = member
+        return member
+
+    def add_channel(self, name='general'):
+        channel = FakeChannel(self, name, self.rest)
+        self.channels[channel.id] = channel
+        return channel
+
+    def get_member(self, user_id):
+        return self.members.get(user_id) if self.cache_members else None
+
+    async def fetch_member(self, user_id):
+        await self.rest.call()
+        member = self.members.get(user_id)
+        if member is None:
+            raise discord.NotFound(FakeHTTPResponse(404, 'Not Found'), 'Unknown Member')
+        return member
+
+
+class FakeResponse:
+    """interaction.response: the single initial response, with its timing."""
+
+    def __init__(self, interaction):
+        self.interaction = interaction
+        self.done = False
+        self.deferred = False
+        self.deleted = False
+        self.acked_at = None
+        self.messages = []
+
+    def is_done(self):
+        return self.done
+
+    async def _acknowledge(self):
+        if self.done:
+            raise discord.InteractionResponded(self.interaction)
+        self.done = True
+        self.acked_at = time.perf_counter()
+        await self.interaction.rest.call()
+
+    async def send_message(self, content=None, embed=None, ephemeral=False, view=None, **kwargs):
+        await self._acknowledge()
+        self.messages.append(FakeMessage(self.interaction.channel, content, embed, view))
+
+    async def defer(self, ephemeral=False, thinking=False):
+        await self._acknowledge()
+        self.deferred = True
+
+    async def edit_message(self, content=None, embed=None, view=None, **kwargs):
+        await self._acknowledge()
+        self.messages.append(FakeMessage(self.interaction.channel, content, embed, view))
+
+
+class FakeFollowup:
+    """interaction.followup: messages sent after the initial response."""
+
+    def __init__(self, interaction):
+        self.interaction = interaction
+        self.messages = []
+
+    async def send(self, content=None, embed=None, ephemeral=False, view=None, file=None, **kwargs):
+        if not self.interaction.response.done:
+            raise discord.NotFound(FakeHTTPResponse(404, 'Not Found'), 'Unknown Webhook')
+        await self.interaction.rest.call()
+        message = FakeMessage(self.interaction.channel, content, embed, view)
+        self.messages.append(message)
+        return message
+
+
+class FakeInteraction:
+    """An application command interaction from user in channel of guild (None for a DM)."""
+
+    def __init__(self, user, guild=None, channel=None, rest=None):
+        self.id = next_id()
+        self.type = discord.InteractionType.application_command
+        self.user = user
+        self.guild = guild
+        self.guild_id = guild.id if guild else None
+        self.channel = channel
+        self.rest = rest or (guild.rest if guild else FakeREST())
+        self.command = None
+        self.data = {}
+        self.extras = {}
+        self.created_at = time.perf_counter()
+        self.response = FakeResponse(self)
+        self.followup = FakeFollowup(self)
+
+    async def edit_original_response(self, **kwargs):
+        await self.rest.call()
+
+    async def delete_original_response(self):
+        await self.rest.call()
+        self.response.deleted = True
+
+    @property
+    def ack_latency(self):
+        """Seconds until the interaction was acknowledged, or None if it never was."""
+        if self.response.acked_at is None:
+            return None
+        return self.response.acked_at - self.created_at
+
+    @property
+    def replies(self):
+        """Every message the command sent back, initial response first."""
+        return self.response.messages + self.followup.messages
+
+
+async def invoke(tree, name, interaction, **params):
+    """Run the slash command name with interaction, like discord.py's dispatch.
+
+    Returns the exception the command raised, or None if it succeeded.
+    """
+    command = tree.get_command(name)
+    if command is None:
+        raise ValueError(f"No command named {name}")
+    interaction.command = command
+    interaction.data = {'name': name}
+    interaction.created_at = time.perf_counter()
+
+    await tree.interaction_check(interaction)
+    try:
+        await command.callback(interaction, **params)
+    except asyncio.CancelledError:
+        # Commands that run past their budget are cancelled by their deadline watchdog
+        deadline = interaction.extras.get('deadline')
+        if deadline is None or not deadline.expired:
+            raise
+        asyncio.current_task().uncancel()
+        return asyncio.TimeoutError(f"/{name} ran past its {deadline.budget:g}s budget")
+    except Exception as e:
+        await tree.on_error(interaction, app_commands.CommandInvokeError(command, e))
+        return e
+    tree.finish_interaction(interaction)
+    return None
+
+
+async def autocomplete(tree, name, param, interaction, current):
+    """Run the autocomplete callback for a command parameter and return its choices."""
+    command = tree.get_command(name)
+    if command is None:
+        raise ValueError(f"No command named {name}")
+    interaction.type = discord.InteractionType.autocomplete
+    interaction.command = command
+    # discord.py keeps the registered callback on the command's private parameter map
+    callback = command._params[param].autocomplete
+    if callback is None:
+        raise ValueError(f"/{name} has no autocomplete for {param}")
+    return await callback(interaction, current)
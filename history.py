@@ -1,28 +1,61 @@
+import atexit
+import bisect
 import csv
+import hashlib
+import io
+import itertools
 import os
-from collections import defaultdict
+import pickle
+import threading
+from array import array
+
+from cfb_teams import CFB_TEAMS
+from storage import home_guild_id, write_bytes_atomic
 
 DATA_DIR = os.path.join(os.path.dirname(__file__), 'data')
 
-def load_game_history():
+GAME_FIELDS = ['season', 'week', 'team1', 'team2', 'score1', 'score2']
+SEASON_FIELDS = ['season', 'champion', 'runner_up', 'heisman', 'heisman_team']
+
+# Pickled GameStore state, plus how much of game_history.csv it covers
+SNAPSHOT_FILE = 'history.snapshot'
+SNAPSHOT_VERSION = 5
+# Rewrite the snapshot at load when more rows than this had to be replayed
+SNAPSHOT_REPLAY_LIMIT = 1000
+# Read size when hashing the CSV prefix a snapshot covers
+SNAPSHOT_HASH_CHUNK = 1024 * 1024
+
+# Games per chunk when streaming history out
+EXPORT_CHUNK_SIZE = 5000
+
+
+def league_data_dir(guild_id=None):
+    """Get the directory holding a league's history files.
+
+    The home league keeps using data/; every other guild gets its own
+    data/guilds/<guild_id>/ partition, created when the league or its
+    history store is first opened.
+    """
+    if guild_id is None or int(guild_id) == home_guild_id():
+        return DATA_DIR
+    return os.path.join(DATA_DIR, 'guilds', str(guild_id))
+
+
+def load_game_history(data_dir=None):
     """Load all games from CSV."""
-    filepath = os.path.join(DATA_DIR, 'game_history.csv')
+    filepath = os.path.join(data_dir or DATA_DIR, 'game_history.csv')
     games = []
     if os.path.exists(filepath):
         with open(filepath, 'r', newline='', encoding='utf-8') as f:
             reader = csv.DictReader(f)
             for row in reader:
-                row['score1'] = int(row['score1'])
-                row['score2'] = int(row['score2'])
-                row['season'] = int(row['season'])
-                row['week'] = int(row['week'])
-                games.append(row)
+                games.append(_parse_game(row))
     return games
 
 
-def load_season_history():
+def load_season_history(data_dir=None):
     """Load season championship history from CSV."""
-    filepath = os.path.join(DATA_DIR, 'season_history.csv')
+    filepath = os.path.join(data_dir or DATA_DIR, 'season_history.csv')
     seasons = []
     if os.path.exists(filepath):
         with open(filepath, 'r', newline='', encoding='utf-8') as f:
@@ -33,122 +66,613 @@ def load_season_history():
     return sorted(seasons, key=lambda x: x['season'], reverse=True)
 
 
-def save_game(season, week, team1, team2, score1, score2):
-    """Add a game to history."""
-    filepath = os.path.join(DATA_DIR, 'game_history.csv')
-    file_exists = os.path.exists(filepath)
+def _append_csv_row(data_dir, filename, header, row):
+    """Append one row to a CSV file in data_dir, writing the header if new.
 
-    with open(filepath, 'a', newline='', encoding='utf-8') as f:
-        writer = csv.writer(f)
-        if not file_exists:
-            writer.writerow(['season', 'week', 'team1', 'team2', 'score1', 'score2'])
-        writer.writerow([season, week, team1, team2, score1, score2])
+    Returns the file size after the write.
+    """
+    return _append_csv_rows(data_dir, filename, header, [row])
 
 
-def save_season(season, champion, runner_up, heisman, heisman_team):
-    """Add a season to history."""
-    filepath = os.path.join(DATA_DIR, 'season_history.csv')
+def _append_csv_rows(data_dir, filename, header, rows, digest=None):
+    """Append rows to a CSV file in data_dir in one write, adding the header if new.
+
+    If digest is given, it's updated with the bytes written. Returns the
+    file size after the write.
+    """
+    filepath = os.path.join(data_dir, filename)
     file_exists = os.path.exists(filepath)
 
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    if not file_exists:
+        writer.writerow(header)
+    writer.writerows(rows)
+    data = buffer.getvalue()
     with open(filepath, 'a', newline='', encoding='utf-8') as f:
-        writer = csv.writer(f)
-        if not file_exists:
-            writer.writerow(['season', 'champion', 'runner_up', 'heisman', 'heisman_team'])
-        writer.writerow([season, champion, runner_up, heisman, heisman_team])
+        f.write(data)
+    if digest is not None:
+        digest.update(data.encode('utf-8'))
+    return os.path.getsize(filepath)
+
+
+def _parse_game(row):
+    """Convert a game CSV row's numeric fields to ints."""
+    row['score1'] = int(row['score1'])
+    row['score2'] = int(row['score2'])
+    row['season'] = int(row['season'])
+    row['week'] = int(row['week'])
+    return row
+
+
+def _prefix_digest(f, offset):
+    """Hash the first offset bytes of an open binary file.
+
+    The whole prefix is hashed, so a hand edit anywhere in the covered
+    rows invalidates the snapshot. Returns the hash object, so appends
+    can keep updating it.
+    """
+    digest = hashlib.sha1()
+    f.seek(0)
+    remaining = offset
+    while remaining > 0:
+        chunk = f.read(min(SNAPSHOT_HASH_CHUNK, remaining))
+        if not chunk:
+            break
+        digest.update(chunk)
+        remaining -= len(chunk)
+    return digest
+
+
+class GameStore:
+    """In-memory copy of the game and season history.
+
+    Loaded from the CSV files once, then kept in sync by save_game and
+    save_season so queries never touch the disk. Safe to share between
+    the storage threads.
+
+    Games are kept as int columns, with team names stored once, and the
+    per-team and per-matchup indexes hold row numbers; game dicts are
+    only built for the rows a query returns. The aggregates and indexes
+    are also pickled to a snapshot file. On the next start the snapshot
+    is restored and only the game rows appended to the CSV since then
+    are replayed.
+    """
+
+    SNAPSHOT_FIELDS = ('columns', 'team_names', 'seasons', 'last_weeks', 'records', 'rankings', '_rank_keys',
+                       'team_games', 'team_wins', 'pair_games', 'pair_wins')
+
+    def __init__(self, data_dir=None):
+        self.data_dir = data_dir or DATA_DIR
+        self.lock = threading.RLock()
+        # One int column per game field; team1 and team2 index into team_names
+        self.columns = {field: array('i') for field in GAME_FIELDS}
+        self.team_names = []
+        self.team_ids = {}
+        self.championships = []
+        self.seasons = set()
+        # Latest week with a game, per season
+        self.last_weeks = {}
+        # Standings per season, plus all-time under the None key
+        self.records = {}
+        self.rankings = {}
+        self._rank_keys = {}
+        # Game rows by team and by unordered matchup, with series wins per matchup
+        self.team_games = {}
+        # Games each team won outright, as shown in its game history
+        self.team_wins = {}
+        self.pair_games = {}
+        self.pair_wins = {}
+        # Bytes of game_history.csv reflected in memory and in the snapshot, and their hash
+        self.csv_offset = 0
+        self.snapshot_offset = 0
+        self.digest = hashlib.sha1()
+
+    def load(self):
+        """Read both CSV files into memory, starting from the snapshot if it's valid."""
+        if not self._load_snapshot():
+            csv_path = os.path.join(self.data_dir, 'game_history.csv')
+            if os.path.exists(csv_path):
+                with open(csv_path, 'rb') as f:
+                    self.csv_offset = os.fstat(f.fileno()).st_size
+                    self.digest = _prefix_digest(f, self.csv_offset)
+            for game in load_game_history(self.data_dir):
+                self.add_game(game)
+            if self.game_count():
+                self.save_snapshot()
+        self.championships = load_season_history(self.data_dir)
+        return self
+
+    def _load_snapshot(self):
+        """Restore the snapshot and replay newer CSV rows. Returns False if unusable."""
+        snapshot_path = os.path.join(self.data_dir, SNAPSHOT_FILE)
+        csv_path = os.path.join(self.data_dir, 'game_history.csv')
+        if not os.path.exists(snapshot_path) or not os.path.exists(csv_path):
+            return False
+
+        try:
+            with open(snapshot_path, 'rb') as f:
+                snapshot = pickle.load(f)
+        except Exception:
+            return False
+        offset = snapshot.get('csv_offset', 0)
+        if snapshot.get('version') != SNAPSHOT_VERSION or offset <= 0:
+            return False
 
+        # The CSV must still start with exactly what the snapshot covered
+        with open(csv_path, 'rb') as f:
+            if os.fstat(f.fileno()).st_size < offset:
+                return False
+            digest = _prefix_digest(f, offset)
+            if digest.hexdigest() != snapshot['digest']:
+                return False
+            f.seek(offset)
+            new_rows = f.read()
 
-def get_standings(season=None):
-    """Calculate W-L records from game history."""
-    games = load_game_history()
-    if season:
-        games = [g for g in games if g['season'] == season]
+        for field in self.SNAPSHOT_FIELDS:
+            setattr(self, field, snapshot['state'][field])
+        self.team_ids = {team: i for i, team in enumerate(self.team_names)}
+        self.csv_offset = self.snapshot_offset = offset
+        self.digest = digest
+        digest.update(new_rows)
 
-    records = defaultdict(lambda: {'wins': 0, 'losses': 0, 'points_for': 0, 'points_against': 0})
+        replayed = 0
+        for values in csv.reader(io.StringIO(new_rows.decode('utf-8'))):
+            if values:
+                self.add_game(_parse_game(dict(zip(GAME_FIELDS, values))))
+                replayed += 1
+        self.csv_offset = offset + len(new_rows)
+        if replayed > SNAPSHOT_REPLAY_LIMIT:
+            self.save_snapshot()
+        return True
 
-    for game in games:
+    def save_snapshot(self):
+        """Write the in-memory aggregates and indexes to the snapshot file."""
+        with self.lock:
+            if not self.csv_offset:
+                return
+            data = pickle.dumps({
+                'version': SNAPSHOT_VERSION,
+                'csv_offset': self.csv_offset,
+                'digest': self.digest.hexdigest(),
+                'state': {field: getattr(self, field) for field in self.SNAPSHOT_FIELDS},
+            }, protocol=pickle.HIGHEST_PROTOCOL)
+            offset = self.csv_offset
+        write_bytes_atomic(os.path.join(self.data_dir, SNAPSHOT_FILE), data)
+        self.snapshot_offset = offset
+
+    def save_game(self, game):
+        """Append a game to the CSV log and the in-memory history."""
+        with self.lock:
+            self.csv_offset = _append_csv_rows(self.data_dir, 'game_history.csv', GAME_FIELDS,
+                                               [[game[k] for k in GAME_FIELDS]], self.digest)
+            self.add_game(game)
+
+    def save_games(self, games):
+        """Append many games to the CSV log in one write, then re-rank once."""
+        with self.lock:
+            self.csv_offset = _append_csv_rows(self.data_dir, 'game_history.csv', GAME_FIELDS,
+                                               [[game[k] for k in GAME_FIELDS] for game in games], self.digest)
+            for game in games:
+                self.add_game(game, rank=False)
+            for scope in {game['season'] for game in games} | {None}:
+                self.rankings[scope] = sorted(self._rank_keys[scope].values())
+
+    def save_season(self, season):
+        """Append a season to the CSV log and the in-memory history."""
+        with self.lock:
+            _append_csv_row(self.data_dir, 'season_history.csv', SEASON_FIELDS, [season[k] for k in SEASON_FIELDS])
+            self.add_season(season)
+
+    def add_game(self, game, rank=True):
+        """Add one parsed game row to the in-memory history.
+
+        With rank=False the standings rankings are left stale; the caller
+        rebuilds them from _rank_keys once the batch is in.
+        """
+        row = self.game_count()
         t1, t2 = game['team1'], game['team2']
-        s1, s2 = game['score1'], game['score2']
+        columns = self.columns
+        columns['season'].append(game['season'])
+        columns['week'].append(game['week'])
+        columns['team1'].append(self._team_id(t1))
+        columns['team2'].append(self._team_id(t2))
+        columns['score1'].append(game['score1'])
+        columns['score2'].append(game['score2'])
+        self.seasons.add(game['season'])
+        if game['week'] > self.last_weeks.get(game['season'], 0):
+            self.last_weeks[game['season']] = game['week']
 
-        records[t1]['points_for'] += s1
-        records[t1]['points_against'] += s2
-        records[t2]['points_for'] += s2
-        records[t2]['points_against'] += s1
+        s1, s2 = game['score1'], game['score2']
+        for scope in (game['season'], None):
+            self._update_record(scope, t1, s1, s2, s1 > s2, rank)
+            self._update_record(scope, t2, s2, s1, s1 <= s2, rank)
 
+        self.team_games.setdefault(t1, array('I')).append(row)
+        if t2 != t1:
+            self.team_games.setdefault(t2, array('I')).append(row)
         if s1 > s2:
-            records[t1]['wins'] += 1
-            records[t2]['losses'] += 1
+            self.team_wins[t1] = self.team_wins.get(t1, 0) + 1
+        elif s2 > s1 and t2 != t1:
+            self.team_wins[t2] = self.team_wins.get(t2, 0) + 1
+
+        pair, side = _matchup(t1, t2)
+        self.pair_games.setdefault(pair, array('I')).append(row)
+        series = self.pair_wins.setdefault(pair, [0, 0])
+        series[side if s1 > s2 else 1 - side] += 1
+
+    def _team_id(self, team):
+        """Get the index of a team's name in team_names, adding it if new."""
+        team_id = self.team_ids.get(team)
+        if team_id is None:
+            team_id = self.team_ids[team] = len(self.team_names)
+            self.team_names.append(team)
+        return team_id
+
+    def game_count(self):
+        """Get the number of games logged."""
+        return len(self.columns['season'])
+
+    def _games(self, rows):
+        """Build game dicts for rows, in order. Call with the lock held."""
+        season, week, team1, team2, score1, score2 = (self.columns[field] for field in GAME_FIELDS)
+        names = self.team_names
+        return [
+            {'season': season[row], 'week': week[row], 'team1': names[team1[row]], 'team2': names[team2[row]],
+             'score1': score1[row], 'score2': score2[row]}
+            for row in rows
+        ]
+
+    def _update_record(self, scope, team, points_for, points_against, won, rank=True):
+        """Apply one game to a team's record and move it to its new rank."""
+        records = self.records.setdefault(scope, {})
+        ranking = self.rankings.setdefault(scope, [])
+        rank_keys = self._rank_keys.setdefault(scope, {})
+
+        record = records.get(team)
+        if record is None:
+            record = records[team] = {'wins': 0, 'losses': 0, 'points_for': 0, 'points_against': 0}
+            order = len(records)
+        else:
+            old_key = rank_keys[team]
+            order = old_key[2]
+            if rank:
+                del ranking[bisect.bisect_left(ranking, old_key)]
+
+        record['points_for'] += points_for
+        record['points_against'] += points_against
+        if won:
+            record['wins'] += 1
         else:
-            records[t2]['wins'] += 1
-            records[t1]['losses'] += 1
+            record['losses'] += 1
+
+        # Sort by wins, then point differential, ties keep first-seen order
+        key = (-record['wins'], record['points_against'] - record['points_for'], order, team)
+        rank_keys[team] = key
+        if rank:
+            bisect.insort(ranking, key)
+
+    def add_season(self, season):
+        """Add one parsed season row, keeping newest seasons first."""
+        bisect.insort(self.championships, season, key=lambda x: -x['season'])
+
+    def standings(self, season=None):
+        """Get W-L records sorted by wins, then point differential."""
+        with self.lock:
+            records = self.records.get(season, {})
+            return [(key[3], dict(records[key[3]])) for key in self.rankings.get(season, [])]
+
+    def standings_page(self, season=None, offset=0, limit=15):
+        """Get one page of the standings and the number of teams in them."""
+        with self.lock:
+            records = self.records.get(season, {})
+            ranking = self.rankings.get(season, [])
+            return [(key[3], dict(records[key[3]])) for key in ranking[offset:offset + limit]], len(ranking)
+
+    def head_to_head(self, team1, team2):
+        """Get head-to-head record between two teams."""
+        pair, side = _matchup(team1, team2)
+        with self.lock:
+            series = self.pair_wins.get(pair, [0, 0])
+            return {
+                'team1': team1,
+                'team2': team2,
+                'team1_wins': series[side],
+                'team2_wins': series[1 - side],
+                'games': self._games(self.pair_games.get(pair, ()))
+            }
+
+    def team_history(self, team):
+        """Get all games for a specific team."""
+        with self.lock:
+            games = self._games(self.team_games.get(team, ()))
+        return [_team_result(team, game) for game in games]
+
+    def team_history_page(self, team, offset=0, limit=10):
+        """Get one page of a team's games and its overall record.
+
+        offset counts back from the most recent game; the page itself is in
+        chronological order. Only the games on the page are normalized, and
+        the record is kept up to date by add_game rather than recounted.
+        """
+        with self.lock:
+            rows = self.team_games.get(team, ())
+            end = max(0, len(rows) - offset)
+            page = self._games(rows[max(0, end - limit):end])
+            wins = self.team_wins.get(team, 0)
+            total = len(rows)
+        return {
+            'games': [_team_result(team, game) for game in page],
+            'total': total,
+            'wins': wins,
+            'losses': total - wins
+        }
+
+    def championship_history(self):
+        """Get championship history, newest season first."""
+        with self.lock:
+            return list(self.championships)
+
+    def championship_page(self, offset=0, limit=10):
+        """Get one page of championship history and the number of seasons in it."""
+        with self.lock:
+            return self.championships[offset:offset + limit], len(self.championships)
+
+    def all_seasons(self):
+        """Get list of all seasons with games, newest first."""
+        with self.lock:
+            return sorted(self.seasons, reverse=True)
+
+    def last_week(self, season):
+        """Get the latest week with a game in season, or 0 if it has none."""
+        with self.lock:
+            return self.last_weeks.get(season, 0)
+
+    def iter_games(self, start=0, chunk_size=EXPORT_CHUNK_SIZE):
+        """Yield the games logged so far in chunks, oldest first, skipping the first start games."""
+        with self.lock:
+            count = self.game_count()
+        # Games are only ever appended, so the first count rows never change
+        for start in range(start, count, chunk_size):
+            with self.lock:
+                chunk = self._games(range(start, min(start + chunk_size, count)))
+            yield chunk
+
 
-    # Sort by wins, then point differential
-    sorted_teams = sorted(
-        records.items(),
-        key=lambda x: (x[1]['wins'], x[1]['points_for'] - x[1]['points_against']),
-        reverse=True
-    )
-    return sorted_teams
+def _team_won(team, game):
+    """Whether team won a game it played in."""
+    if game['team1'] == team:
+        return game['score1'] > game['score2']
+    return game['score2'] > game['score1']
 
 
-def get_head_to_head(team1, team2):
+def _team_result(team, game):
+    """Normalize a game so the requested team is always "team"."""
+    if game['team1'] == team:
+        opponent, score = game['team2'], f"{game['score1']}-{game['score2']}"
+    else:
+        opponent, score = game['team1'], f"{game['score2']}-{game['score1']}"
+    return {
+        'season': game['season'],
+        'week': game['week'],
+        'opponent': opponent,
+        'score': score,
+        'result': 'W' if _team_won(team, game) else 'L'
+    }
+
+
+def _matchup(team1, team2):
+    """Get the unordered matchup key for two teams and team1's side of it."""
+    if team1 <= team2:
+        return (team1, team2), 0
+    return (team2, team1), 1
+
+
+# Resident history stores, one per league data directory
+_stores = {}
+_stores_lock = threading.Lock()
+
+# Data version per league, changed on every write so readers can cache results
+_versions = {}
+_version_counter = itertools.count(1)
+
+# Functions called as listener(guild_id) after games are saved
+_game_listeners = []
+
+
+def _open_store(data_dir):
+    """Open the configured history backend for one league.
+
+    Set HISTORY_DB to a SQLite file path to use the SQLite backend, or
+    HISTORY_BACKEND=columnar for NumPy columns. Otherwise the CSV files
+    are loaded into memory. With SQLite, leagues other than the home
+    league use a history.db file in their own data directory.
+    """
+    os.makedirs(data_dir, exist_ok=True)
+    db_path = os.getenv('HISTORY_DB')
+    if db_path:
+        from history_db import SQLiteGameStore
+        if data_dir != DATA_DIR:
+            db_path = os.path.join(data_dir, 'history.db')
+        return SQLiteGameStore(db_path)
+    if os.getenv('HISTORY_BACKEND') == 'columnar':
+        from history_columnar import ColumnarGameStore
+        return ColumnarGameStore(data_dir).load()
+    return GameStore(data_dir).load()
+
+
+def get_store(guild_id=None):
+    """Get a league's resident history store, loading it on first use."""
+    data_dir = league_data_dir(guild_id)
+    store = _stores.get(data_dir)
+    if store is None:
+        with _stores_lock:
+            store = _stores.get(data_dir)
+            if store is None:
+                store = _stores[data_dir] = _open_store(data_dir)
+    return store
+
+
+def load_store(guild_id=None):
+    """(Re)load a league's history store from disk. Call once at startup."""
+    data_dir = league_data_dir(guild_id)
+    with _stores_lock:
+        store = _stores[data_dir] = _open_store(data_dir)
+        _versions[data_dir] = next(_version_counter)
+    return store
+
+
+def _bump_version(guild_id):
+    """Give a league a new data version after a write."""
+    data_dir = league_data_dir(guild_id)
+    with _stores_lock:
+        _versions[data_dir] = next(_version_counter)
+
+
+def add_game_listener(listener):
+    """Call listener(guild_id) after games are saved to a league, on the saving thread."""
+    _game_listeners.append(listener)
+
+
+def _notify_game_listeners(guild_id):
+    for listener in _game_listeners:
+        try:
+            listener(guild_id)
+        except Exception as e:
+            print(f'Game listener {listener.__name__} failed: {e}')
+
+
+def data_version(guild_id=None):
+    """Get a league's data version. It changes whenever a game or season is saved."""
+    return _versions.get(league_data_dir(guild_id), 0)
+
+
+def save_snapshots():
+    """Snapshot every loaded in-memory store that changed since its last snapshot."""
+    for store in list(_stores.values()):
+        if isinstance(store, GameStore) and store.csv_offset != store.snapshot_offset:
+            store.save_snapshot()
+
+
+atexit.register(save_snapshots)
+
+
+def save_game(season, week, team1, team2, score1, score2, guild_id=None):
+    """Add a game to history."""
+    get_store(guild_id).save_game({
+        'season': int(season), 'week': int(week), 'team1': team1, 'team2': team2,
+        'score1': int(score1), 'score2': int(score2)
+    })
+    _bump_version(guild_id)
+    _notify_game_listeners(guild_id)
+
+
+def parse_games_csv(text):
+    """Parse and validate uploaded game rows in the game_history.csv format.
+
+    Team names are matched against CFB_TEAMS, ignoring case, in one pass
+    over the distinct names in the file. Returns (games, errors); errors
+    are human-readable strings naming the CSV line.
+    """
+    reader = csv.DictReader(io.StringIO(text))
+    missing = [field for field in GAME_FIELDS if field not in (reader.fieldnames or [])]
+    if missing:
+        return [], [f"Missing column(s): {', '.join(missing)}"]
+
+    # Line numbers come from the reader, since blank lines and quoted newlines shift them
+    rows = [(reader.line_num, row) for row in reader]
+    canonical = {name.lower(): name for name in CFB_TEAMS}
+    names = {(row[k] or '').strip() for _, row in rows for k in ('team1', 'team2')}
+    resolved = {name: canonical.get(name.lower()) for name in names}
+
+    games, errors = [], []
+    for line, row in rows:
+        try:
+            game = _parse_game({k: row[k] for k in GAME_FIELDS})
+        except (TypeError, ValueError):
+            errors.append(f"Line {line}: season, week and scores must be whole numbers")
+            continue
+        game['team1'] = resolved[(row['team1'] or '').strip()]
+        game['team2'] = resolved[(row['team2'] or '').strip()]
+        unknown = [row[k] for k in ('team1', 'team2') if game[k] is None]
+        if unknown:
+            errors.append(f"Line {line}: unknown team(s) {', '.join(repr(name) for name in unknown)}")
+        elif game['team1'] == game['team2']:
+            errors.append(f"Line {line}: a team can't play itself")
+        else:
+            games.append(game)
+    return games, errors
+
+
+def save_games(games, guild_id=None):
+    """Add many parsed games to history in a single write."""
+    if games:
+        get_store(guild_id).save_games(games)
+        _bump_version(guild_id)
+        _notify_game_listeners(guild_id)
+
+
+def export_games(path, guild_id=None):
+    """Write a league's game history to path as CSV, a chunk at a time. Returns the game count."""
+    count = 0
+    with open(path, 'w', newline='', encoding='utf-8') as f:
+        writer = csv.writer(f)
+        writer.writerow(GAME_FIELDS)
+        for chunk in get_store(guild_id).iter_games():
+            writer.writerows([game[k] for k in GAME_FIELDS] for game in chunk)
+            count += len(chunk)
+    return count
+
+
+def save_season(season, champion, runner_up, heisman, heisman_team, guild_id=None):
+    """Add a season to history."""
+    get_store(guild_id).save_season({
+        'season': int(season), 'champion': champion, 'runner_up': runner_up,
+        'heisman': heisman, 'heisman_team': heisman_team
+    })
+    _bump_version(guild_id)
+
+
+def get_standings(season=None, guild_id=None):
+    """Get W-L records sorted by wins, then point differential."""
+    return get_store(guild_id).standings(season if season else None)
+
+
+def get_head_to_head(team1, team2, guild_id=None):
     """Get head-to-head record between two teams."""
-    games = load_game_history()
-    results = {'team1': team1, 'team2': team2, 'team1_wins': 0, 'team2_wins': 0, 'games': []}
-
-    for game in games:
-        if (game['team1'] == team1 and game['team2'] == team2):
-            results['games'].append(game)
-            if game['score1'] > game['score2']:
-                results['team1_wins'] += 1
-            else:
-                results['team2_wins'] += 1
-        elif (game['team1'] == team2 and game['team2'] == team1):
-            results['games'].append(game)
-            if game['score1'] > game['score2']:
-                results['team2_wins'] += 1
-            else:
-                results['team1_wins'] += 1
-
-    return results
-
-
-def get_team_history(team):
+    return get_store(guild_id).head_to_head(team1, team2)
+
+
+def get_team_history(team, guild_id=None):
     """Get all games for a specific team."""
-    games = load_game_history()
-    team_games = []
-
-    for game in games:
-        if game['team1'] == team or game['team2'] == team:
-            # Normalize so requested team is always "team"
-            if game['team1'] == team:
-                result = 'W' if game['score1'] > game['score2'] else 'L'
-                team_games.append({
-                    'season': game['season'],
-                    'week': game['week'],
-                    'opponent': game['team2'],
-                    'score': f"{game['score1']}-{game['score2']}",
-                    'result': result
-                })
-            else:
-                result = 'W' if game['score2'] > game['score1'] else 'L'
-                team_games.append({
-                    'season': game['season'],
-                    'week': game['week'],
-                    'opponent': game['team1'],
-                    'score': f"{game['score2']}-{game['score1']}",
-                    'result': result
-                })
-
-    return team_games
-
-
-def get_championships():
+    return get_store(guild_id).team_history(team)
+
+
+def get_championships(guild_id=None):
     """Get championship history."""
-    return load_season_history()
+    return get_store(guild_id).championship_history()
+
+
+def get_standings_page(season=None, offset=0, limit=15, guild_id=None):
+    """Get one page of the standings as (records, team_count)."""
+    return get_store(guild_id).standings_page(season if season else None, offset, limit)
+
+
+def get_team_history_page(team, offset=0, limit=10, guild_id=None):
+    """Get one page of a team's games, counting back from the most recent, plus its record."""
+    return get_store(guild_id).team_history_page(team, offset, limit)
+
+
+def get_championships_page(offset=0, limit=10, guild_id=None):
+    """Get one page of championship history as (seasons, season_count)."""
+    return get_store(guild_id).championship_page(offset, limit)
+
+
+def get_last_week(season, guild_id=None):
+    """Get the latest week with a game in a season, or 0 if it has none."""
+    return get_store(guild_id).last_week(season)
 
 
-def get_all_seasons():
+def get_all_seasons(guild_id=None):
     """Get list of all seasons in the data."""
-    games = load_game_history()
-    seasons = set(g['season'] for g in games)
-    return sorted(seasons, reverse=True)
+    return get_store(guild_id).all_seasons()
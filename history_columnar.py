@@ -0,0 +1,328 @@
+"""Columnar NumPy backend for game history.
+
+Enable it with HISTORY_BACKEND=columnar. Games are stored as int arrays
+(season, week, team IDs, scores) instead of one dict per row, and the
+standings, point differentials and head-to-head series are computed with
+vectorized reductions. Meant for large simulated or imported leagues.
+"""
+import bisect
+import csv
+import os
+import threading
+
+import numpy as np
+
+import history
+from cfb_teams import CFB_TEAMS
+
+COLUMNS = ('season', 'week', 'team1', 'team2', 'score1', 'score2')
+
+
+class ColumnarGameStore:
+    """History backend that keeps the game log as NumPy columns.
+
+    Team names are mapped to their ESPN IDs from CFB_TEAMS; names outside
+    the catalog get IDs above the highest catalog ID. Per-scope standings
+    aggregates are computed once with bincount and then updated in place
+    by save_game.
+    """
+
+    def __init__(self, data_dir=None, capacity=1024):
+        self.data_dir = data_dir or history.DATA_DIR
+        self.lock = threading.RLock()
+        self.size = 0
+        self.columns = {name: np.zeros(capacity, dtype=np.int32) for name in COLUMNS}
+        self.team_ids = {name: team['id'] for name, team in CFB_TEAMS.items()}
+        self.team_names = {team_id: name for name, team_id in self.team_ids.items()}
+        self.next_id = max(self.team_ids.values()) + 1
+        self.championships = []
+        self.seasons = set()
+        # Standings aggregates per season, plus all-time under the None key
+        self._aggregates = {}
+
+    def load(self):
+        """Read both CSV files into columns."""
+        filepath = os.path.join(self.data_dir, 'game_history.csv')
+        if os.path.exists(filepath):
+            with open(filepath, 'r', newline='', encoding='utf-8') as f:
+                reader = csv.DictReader(f)
+                rows = [
+                    (int(row['season']), int(row['week']), self.team_id(row['team1']),
+                     self.team_id(row['team2']), int(row['score1']), int(row['score2']))
+                    for row in reader
+                ]
+            if rows:
+                table = np.array(rows, dtype=np.int32)
+                self._reserve(len(rows))
+                for i, name in enumerate(COLUMNS):
+                    self.columns[name][:len(rows)] = table[:, i]
+                self.size = len(rows)
+                self.seasons = set(np.unique(table[:, 0]).tolist())
+        self.championships = history.load_season_history(self.data_dir)
+        return self
+
+    def team_id(self, name):
+        """Get the integer ID for a team name, assigning one if it's new."""
+        team_id = self.team_ids.get(name)
+        if team_id is None:
+            team_id = self.team_ids[name] = self.next_id
+            self.team_names[team_id] = name
+            self.next_id += 1
+        return team_id
+
+    def _reserve(self, count):
+        """Grow the columns so they can hold at least count games."""
+        capacity = len(self.columns['season'])
+        if count <= capacity:
+            return
+        while capacity < count:
+            capacity *= 2
+        for name, column in self.columns.items():
+            grown = np.zeros(capacity, dtype=np.int32)
+            grown[:self.size] = column[:self.size]
+            self.columns[name] = grown
+
+    def _view(self, season=None):
+        """Get the filled part of each column, optionally for one season."""
+        view = {name: column[:self.size] for name, column in self.columns.items()}
+        if season is not None:
+            mask = view['season'] == season
+            view = {name: column[mask] for name, column in view.items()}
+        return view
+
+    def save_game(self, game):
+        """Append a game to the CSV log and the columns."""
+        with self.lock:
+            history._append_csv_row(self.data_dir, 'game_history.csv', history.GAME_FIELDS,
+                                    [game[k] for k in history.GAME_FIELDS])
+            row = (game['season'], game['week'], self.team_id(game['team1']),
+                   self.team_id(game['team2']), game['score1'], game['score2'])
+
+            self._reserve(self.size + 1)
+            for name, value in zip(COLUMNS, row):
+                self.columns[name][self.size] = value
+            self.size += 1
+            self.seasons.add(game['season'])
+
+            for scope in (game['season'], None):
+                aggregates = self._aggregates.get(scope)
+                if aggregates is not None:
+                    self._apply_game(aggregates, row, 2 * (self.size - 1))
+
+    def save_games(self, games):
+        """Append many games to the CSV log in one write and to the columns in one copy.
+
+        Cached aggregates for the affected scopes are dropped and rebuilt
+        with bincount on the next standings query.
+        """
+        with self.lock:
+            history._append_csv_rows(self.data_dir, 'game_history.csv', history.GAME_FIELDS,
+                                     [[game[k] for k in history.GAME_FIELDS] for game in games])
+            table = np.array([
+                (game['season'], game['week'], self.team_id(game['team1']),
+                 self.team_id(game['team2']), game['score1'], game['score2'])
+                for game in games
+            ], dtype=np.int32).reshape(-1, len(COLUMNS))
+
+            self._reserve(self.size + len(table))
+            for i, name in enumerate(COLUMNS):
+                self.columns[name][self.size:self.size + len(table)] = table[:, i]
+            self.size += len(table)
+
+            seasons = set(table[:, 0].tolist())
+            self.seasons |= seasons
+            for scope in seasons | {None}:
+                self._aggregates.pop(scope, None)
+
+    def save_season(self, season):
+        """Append a season to the CSV log and the in-memory history."""
+        with self.lock:
+            history._append_csv_row(self.data_dir, 'season_history.csv', history.SEASON_FIELDS,
+                                    [season[k] for k in history.SEASON_FIELDS])
+            bisect.insort(self.championships, season, key=lambda x: -x['season'])
+
+    def _compute_aggregates(self, season):
+        """Compute per-team wins, losses, points and first appearance with bincount."""
+        view = self._view(season)
+        t1, t2, s1, s2 = view['team1'], view['team2'], view['score1'], view['score2']
+        size = self.next_id
+        team1_won = s1 > s2
+
+        wins = np.bincount(t1[team1_won], minlength=size) + np.bincount(t2[~team1_won], minlength=size)
+        losses = np.bincount(t1[~team1_won], minlength=size) + np.bincount(t2[team1_won], minlength=size)
+        points_for = np.bincount(t1, weights=s1, minlength=size) + np.bincount(t2, weights=s2, minlength=size)
+        points_against = np.bincount(t1, weights=s2, minlength=size) + np.bincount(t2, weights=s1, minlength=size)
+
+        # Ties in the standings keep first-seen order, team1 before team2
+        order = np.arange(len(t1), dtype=np.int64) * 2
+        first_seen = np.full(size, np.iinfo(np.int64).max, dtype=np.int64)
+        np.minimum.at(first_seen, t2, order + 1)
+        np.minimum.at(first_seen, t1, order)
+
+        return {
+            'wins': wins.astype(np.int64),
+            'losses': losses.astype(np.int64),
+            'points_for': points_for.astype(np.int64),
+            'points_against': points_against.astype(np.int64),
+            'first_seen': first_seen,
+        }
+
+    def _apply_game(self, aggregates, row, order):
+        """Update cached aggregates in place for one new game."""
+        _, _, t1, t2, s1, s2 = row
+        size = len(aggregates['wins'])
+        if max(t1, t2) >= size:
+            grow = self.next_id - size
+            for name, column in aggregates.items():
+                fill = np.iinfo(np.int64).max if name == 'first_seen' else 0
+                aggregates[name] = np.concatenate([column, np.full(grow, fill, dtype=np.int64)])
+
+        winner, loser = (t1, t2) if s1 > s2 else (t2, t1)
+        aggregates['wins'][winner] += 1
+        aggregates['losses'][loser] += 1
+        aggregates['points_for'][t1] += s1
+        aggregates['points_against'][t1] += s2
+        aggregates['points_for'][t2] += s2
+        aggregates['points_against'][t2] += s1
+        aggregates['first_seen'][t1] = min(aggregates['first_seen'][t1], order)
+        aggregates['first_seen'][t2] = min(aggregates['first_seen'][t2], order + 1)
+
+    def _ranked(self, season):
+        """Get a scope's aggregates and its team IDs in standings order. Caller holds the lock."""
+        aggregates = self._aggregates.get(season)
+        if aggregates is None:
+            aggregates = self._aggregates[season] = self._compute_aggregates(season)
+
+        wins, losses = aggregates['wins'], aggregates['losses']
+        points_for, points_against = aggregates['points_for'], aggregates['points_against']
+        teams = np.flatnonzero(wins + losses)
+        ranked = teams[np.lexsort((
+            aggregates['first_seen'][teams],
+            points_against[teams] - points_for[teams],
+            -wins[teams],
+        ))]
+        return aggregates, ranked
+
+    def _records(self, aggregates, team_ids):
+        return [
+            (self.team_names[team_id], {
+                'wins': int(aggregates['wins'][team_id]),
+                'losses': int(aggregates['losses'][team_id]),
+                'points_for': int(aggregates['points_for'][team_id]),
+                'points_against': int(aggregates['points_against'][team_id])
+            })
+            for team_id in team_ids.tolist()
+        ]
+
+    def standings(self, season=None):
+        """Get W-L records sorted by wins, then point differential."""
+        with self.lock:
+            aggregates, ranked = self._ranked(season)
+            return self._records(aggregates, ranked)
+
+    def standings_page(self, season=None, offset=0, limit=15):
+        """Get one page of the standings and the number of teams in them."""
+        with self.lock:
+            aggregates, ranked = self._ranked(season)
+            return self._records(aggregates, ranked[offset:offset + limit]), len(ranked)
+
+    def head_to_head(self, team1, team2):
+        """Get head-to-head record between two teams."""
+        with self.lock:
+            results = {'team1': team1, 'team2': team2, 'team1_wins': 0, 'team2_wins': 0, 'games': []}
+            if team1 not in self.team_ids or team2 not in self.team_ids:
+                return results
+
+            view = self._view()
+            id1, id2 = self.team_ids[team1], self.team_ids[team2]
+            home = (view['team1'] == id1) & (view['team2'] == id2)
+            away = (view['team1'] == id2) & (view['team2'] == id1) & ~home
+            team1_won = view['score1'] > view['score2']
+
+            results['team1_wins'] = int(np.count_nonzero(home & team1_won) + np.count_nonzero(away & ~team1_won))
+            results['team2_wins'] = int(np.count_nonzero(home & ~team1_won) + np.count_nonzero(away & team1_won))
+            results['games'] = self._rows(view, np.flatnonzero(home | away))
+            return results
+
+    def _rows(self, view, indexes):
+        """Convert selected column rows back into game dicts."""
+        selected = {name: view[name][indexes].tolist() for name in COLUMNS}
+        return [
+            {
+                'season': season,
+                'week': week,
+                'team1': self.team_names[t1],
+                'team2': self.team_names[t2],
+                'score1': s1,
+                'score2': s2
+            }
+            for season, week, t1, t2, s1, s2 in zip(*(selected[name] for name in COLUMNS))
+        ]
+
+    def _team_indexes(self, team):
+        """Get a team's game rows and a mask of the ones it won. Caller holds the lock."""
+        view = self._view()
+        team_id = self.team_ids[team]
+        home = view['team1'] == team_id
+        indexes = np.flatnonzero(home | (view['team2'] == team_id))
+        won = np.where(home[indexes], view['score1'][indexes] > view['score2'][indexes],
+                       view['score2'][indexes] > view['score1'][indexes])
+        return view, indexes, won
+
+    def team_history(self, team):
+        """Get all games for a specific team."""
+        with self.lock:
+            if team not in self.team_ids:
+                return []
+            view, indexes, _ = self._team_indexes(team)
+            return [history._team_result(team, game) for game in self._rows(view, indexes)]
+
+    def team_history_page(self, team, offset=0, limit=10):
+        """Get one page of a team's games and its overall record.
+
+        offset counts back from the most recent game; the page itself is in
+        chronological order.
+        """
+        with self.lock:
+            if team not in self.team_ids:
+                return {'games': [], 'total': 0, 'wins': 0, 'losses': 0}
+            view, indexes, won = self._team_indexes(team)
+            end = max(0, len(indexes) - offset)
+            page = indexes[max(0, end - limit):end]
+            wins = int(np.count_nonzero(won))
+            return {
+                'games': [history._team_result(team, game) for game in self._rows(view, page)],
+                'total': len(indexes),
+                'wins': wins,
+                'losses': len(indexes) - wins
+            }
+
+    def championship_history(self):
+        """Get championship history, newest season first."""
+        with self.lock:
+            return list(self.championships)
+
+    def championship_page(self, offset=0, limit=10):
+        """Get one page of championship history and the number of seasons in it."""
+        with self.lock:
+            return self.championships[offset:offset + limit], len(self.championships)
+
+    def all_seasons(self):
+        """Get list of all seasons with games, newest first."""
+        with self.lock:
+            return sorted(self.seasons, reverse=True)
+
+    def last_week(self, season):
+        """Get the latest week with a game in season, or 0 if it has none."""
+        with self.lock:
+            weeks = self._view(season)['week']
+            return int(weeks.max()) if len(weeks) else 0
+
+    def iter_games(self, start=0, chunk_size=history.EXPORT_CHUNK_SIZE):
+        """Yield the games logged so far in chunks, oldest first, skipping the first start games."""
+        with self.lock:
+            count = self.size
+        for start in range(start, count, chunk_size):
+            with self.lock:
+                chunk = self._rows(self._view(), np.arange(start, min(start + chunk_size, count)))
+            yield chunk
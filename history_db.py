@@ -0,0 +1,309 @@
+"""SQLite backend for game and season history.
+
+Enable it by setting HISTORY_DB to a local database file. Existing CSV
+history can be copied in once with:
+
+    python history_db.py path/to/history.db
+"""
+import os
+import sqlite3
+import sys
+import threading
+
+from history import EXPORT_CHUNK_SIZE, GAME_FIELDS, SEASON_FIELDS, load_game_history, load_season_history
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS games (
+    id INTEGER PRIMARY KEY,
+    season INTEGER NOT NULL,
+    week INTEGER NOT NULL,
+    team1 TEXT NOT NULL,
+    team2 TEXT NOT NULL,
+    score1 INTEGER NOT NULL,
+    score2 INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_games_season ON games (season);
+CREATE INDEX IF NOT EXISTS idx_games_team1 ON games (team1);
+CREATE INDEX IF NOT EXISTS idx_games_team2 ON games (team2);
+CREATE INDEX IF NOT EXISTS idx_games_season_week ON games (season, week);
+
+CREATE TABLE IF NOT EXISTS season_history (
+    id INTEGER PRIMARY KEY,
+    season INTEGER NOT NULL,
+    champion TEXT NOT NULL,
+    runner_up TEXT NOT NULL,
+    heisman TEXT NOT NULL,
+    heisman_team TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_season_history_season ON season_history (season);
+"""
+
+# Each game counted once per side; ids double so ties keep first-seen order.
+# total is the number of teams, so a LIMITed page still knows how many there are.
+STANDINGS_SQL = """
+WITH sides AS (
+    SELECT team1 AS team, score1 AS pf, score2 AS pa, score1 > score2 AS won, id * 2 AS seen
+    FROM games {where}
+    UNION ALL
+    SELECT team2, score2, score1, score1 <= score2, id * 2 + 1
+    FROM games {where}
+)
+SELECT team, SUM(won) AS wins, COUNT(*) - SUM(won) AS losses,
+       SUM(pf) AS points_for, SUM(pa) AS points_against, COUNT(*) OVER () AS total
+FROM sides
+GROUP BY team
+ORDER BY wins DESC, SUM(pf) - SUM(pa) DESC, MIN(seen)
+"""
+
+# Teams with at least one game in scope, for pages past the end of the standings
+TEAM_COUNT_SQL = """
+SELECT COUNT(*) FROM (SELECT team1 FROM games {where} UNION SELECT team2 FROM games {where})
+"""
+
+# A team's games, normalized so the requested team is always "team"
+TEAM_GAMES_SQL = """
+SELECT season, week,
+       CASE WHEN team1 = :team THEN team2 ELSE team1 END AS opponent,
+       CASE WHEN team1 = :team THEN score1 || '-' || score2 ELSE score2 || '-' || score1 END AS score,
+       CASE WHEN team1 = :team THEN (CASE WHEN score1 > score2 THEN 'W' ELSE 'L' END)
+       ELSE (CASE WHEN score2 > score1 THEN 'W' ELSE 'L' END) END AS result
+FROM games WHERE team1 = :team OR team2 = :team
+"""
+
+# How many iter_games end positions to remember
+READ_ENDS_KEPT = 8
+
+GAME_COLUMNS = ', '.join(GAME_FIELDS)
+SEASON_COLUMNS = ', '.join(SEASON_FIELDS)
+
+
+def connect(db_path):
+    """Open a history database in WAL mode, creating the schema if needed."""
+    conn = sqlite3.connect(db_path, check_same_thread=False)
+    conn.row_factory = sqlite3.Row
+    conn.execute('PRAGMA journal_mode=WAL')
+    conn.execute('PRAGMA synchronous=NORMAL')
+    conn.executescript(SCHEMA)
+    return conn
+
+
+class SQLiteGameStore:
+    """History backend that keeps games and seasons in a local SQLite file.
+
+    Exposes the same query methods as history.GameStore, with the
+    aggregation done in SQL against the indexed tables.
+    """
+
+    def __init__(self, db_path):
+        self.db_path = db_path
+        self.conn = connect(db_path)
+        self.lock = threading.Lock()
+        # Games read so far -> id of the last one, for reads that resume there
+        self._read_ends = {0: 0}
+
+    def _query(self, sql, params=()):
+        with self.lock:
+            return self.conn.execute(sql, params).fetchall()
+
+    def save_game(self, game):
+        """Insert a game in its own transaction."""
+        with self.lock, self.conn:
+            self.conn.execute(
+                f'INSERT INTO games ({GAME_COLUMNS}) VALUES (?, ?, ?, ?, ?, ?)',
+                [game[k] for k in GAME_FIELDS]
+            )
+
+    def save_games(self, games):
+        """Insert many games in a single transaction."""
+        with self.lock, self.conn:
+            self.conn.executemany(
+                f'INSERT INTO games ({GAME_COLUMNS}) VALUES (?, ?, ?, ?, ?, ?)',
+                [[game[k] for k in GAME_FIELDS] for game in games]
+            )
+
+    def save_season(self, season):
+        """Insert a season in its own transaction."""
+        with self.lock, self.conn:
+            self.conn.execute(
+                f'INSERT INTO season_history ({SEASON_COLUMNS}) VALUES (?, ?, ?, ?, ?)',
+                [season[k] for k in SEASON_FIELDS]
+            )
+
+    def standings(self, season=None):
+        """Get W-L records sorted by wins, then point differential."""
+        where, params = self._season_filter(season)
+        return [self._record(row) for row in self._query(STANDINGS_SQL.format(where=where), params)]
+
+    def standings_page(self, season=None, offset=0, limit=15):
+        """Get one page of the standings and the number of teams in them."""
+        where, params = self._season_filter(season)
+        rows = self._query(STANDINGS_SQL.format(where=where) + 'LIMIT :limit OFFSET :offset',
+                           {**params, 'limit': limit, 'offset': offset})
+        if rows:
+            total = rows[0]['total']
+        else:
+            total = self._query(TEAM_COUNT_SQL.format(where=where), params)[0][0] if offset else 0
+        return [self._record(row) for row in rows], total
+
+    @staticmethod
+    def _season_filter(season):
+        if season is None:
+            return '', {}
+        return 'WHERE season = :season', {'season': season}
+
+    @staticmethod
+    def _record(row):
+        return (row['team'], {
+            'wins': row['wins'],
+            'losses': row['losses'],
+            'points_for': row['points_for'],
+            'points_against': row['points_against']
+        })
+
+    def head_to_head(self, team1, team2):
+        """Get head-to-head record between two teams."""
+        params = {'team1': team1, 'team2': team2}
+        rows = self._query(
+            f'SELECT {GAME_COLUMNS} FROM games '
+            'WHERE (team1 = :team1 AND team2 = :team2) OR (team1 = :team2 AND team2 = :team1) '
+            'ORDER BY id',
+            params
+        )
+        series = self._query(
+            'SELECT '
+            'COALESCE(SUM(CASE WHEN team1 = :team1 AND team2 = :team2 THEN score1 > score2 '
+            'ELSE score1 <= score2 END), 0), '
+            'COALESCE(SUM(CASE WHEN team1 = :team1 AND team2 = :team2 THEN score1 <= score2 '
+            'ELSE score1 > score2 END), 0) '
+            'FROM games '
+            'WHERE (team1 = :team1 AND team2 = :team2) OR (team1 = :team2 AND team2 = :team1)',
+            params
+        )[0]
+        return {
+            'team1': team1,
+            'team2': team2,
+            'team1_wins': series[0],
+            'team2_wins': series[1],
+            'games': [dict(row) for row in rows]
+        }
+
+    def team_history(self, team):
+        """Get all games for a specific team."""
+        rows = self._query(TEAM_GAMES_SQL + 'ORDER BY id', {'team': team})
+        return [dict(row) for row in rows]
+
+    def team_history_page(self, team, offset=0, limit=10):
+        """Get one page of a team's games and its overall record.
+
+        offset counts back from the most recent game; the page itself is in
+        chronological order.
+        """
+        params = {'team': team, 'limit': limit, 'offset': offset}
+        rows = self._query(TEAM_GAMES_SQL + 'ORDER BY id DESC LIMIT :limit OFFSET :offset', params)
+        total, wins = self._query(
+            'SELECT COUNT(*), COALESCE(SUM(CASE WHEN team1 = :team THEN score1 > score2 '
+            'ELSE score2 > score1 END), 0) '
+            'FROM games WHERE team1 = :team OR team2 = :team',
+            params
+        )[0]
+        return {
+            'games': [dict(row) for row in reversed(rows)],
+            'total': total,
+            'wins': wins,
+            'losses': total - wins
+        }
+
+    def championship_history(self):
+        """Get championship history, newest season first."""
+        rows = self._query(f'SELECT {SEASON_COLUMNS} FROM season_history ORDER BY season DESC, id')
+        return [dict(row) for row in rows]
+
+    def championship_page(self, offset=0, limit=10):
+        """Get one page of championship history and the number of seasons in it."""
+        rows = self._query(
+            f'SELECT {SEASON_COLUMNS} FROM season_history ORDER BY season DESC, id LIMIT ? OFFSET ?',
+            (limit, offset)
+        )
+        total = self._query('SELECT COUNT(*) FROM season_history')[0][0]
+        return [dict(row) for row in rows], total
+
+    def all_seasons(self):
+        """Get list of all seasons with games, newest first."""
+        return [row[0] for row in self._query('SELECT DISTINCT season FROM games ORDER BY season DESC')]
+
+    def last_week(self, season):
+        """Get the latest week with a game in season, or 0 if it has none."""
+        return self._query('SELECT COALESCE(MAX(week), 0) FROM games WHERE season = ?', (season,))[0][0]
+
+    def iter_games(self, start=0, chunk_size=EXPORT_CHUNK_SIZE):
+        """Yield the games in chunks, oldest first, skipping the first start games.
+
+        Reads from a separate connection so writes aren't held up. When
+        start is where an earlier read ended (as with the ratings catching
+        up), the read seeks past the last id it saw instead of stepping
+        over every earlier row with OFFSET.
+        """
+        with self.lock:
+            after = self._read_ends.get(start)
+        conn = connect(self.db_path)
+        try:
+            if after is not None:
+                cursor = conn.execute(f'SELECT id, {GAME_COLUMNS} FROM games WHERE id > ? ORDER BY id', (after,))
+            else:
+                cursor = conn.execute(f'SELECT id, {GAME_COLUMNS} FROM games ORDER BY id LIMIT -1 OFFSET ?',
+                                      (start,))
+            position = start
+            while True:
+                rows = cursor.fetchmany(chunk_size)
+                if not rows:
+                    break
+                position += len(rows)
+                after = rows[-1]['id']
+                yield [{field: row[field] for field in GAME_FIELDS} for row in rows]
+        finally:
+            conn.close()
+
+        if after is not None:
+            with self.lock:
+                self._read_ends[position] = after
+                while len(self._read_ends) > READ_ENDS_KEPT:
+                    del self._read_ends[next(iter(self._read_ends))]
+
+
+def migrate_csv(db_path, data_dir=None):
+    """Copy game_history.csv and season_history.csv into a new SQLite database.
+
+    Refuses to run against a database that already holds history, so the
+    migration can't be applied twice.
+    """
+    conn = connect(db_path)
+    try:
+        existing = conn.execute(
+            'SELECT (SELECT COUNT(*) FROM games) + (SELECT COUNT(*) FROM season_history)'
+        ).fetchone()[0]
+        if existing:
+            raise ValueError(f'{db_path} already contains history; not migrating')
+
+        games = load_game_history(data_dir)
+        seasons = sorted(load_season_history(data_dir), key=lambda x: x['season'])
+        with conn:
+            conn.executemany(
+                f'INSERT INTO games ({GAME_COLUMNS}) VALUES (?, ?, ?, ?, ?, ?)',
+                ([g[k] for k in GAME_FIELDS] for g in games)
+            )
+            conn.executemany(
+                f'INSERT INTO season_history ({SEASON_COLUMNS}) VALUES (?, ?, ?, ?, ?)',
+                ([s[k] for k in SEASON_FIELDS] for s in seasons)
+            )
+    finally:
+        conn.close()
+    return len(games), len(seasons)
+
+
+if __name__ == '__main__':
+    target = sys.argv[1] if len(sys.argv) > 1 else os.getenv('HISTORY_DB')
+    if not target:
+        print("Usage: python history_db.py path/to/history.db (or set HISTORY_DB)")
+        sys.exit(1)
+    game_count, season_count = migrate_csv(target)
+    print(f"Migrated {game_count} game(s) and {season_count} season(s) into {target}")
@@ -0,0 +1,84 @@
+"""Per-guild league state, so one bot process can host many dynasty leagues."""
+import json
+import os
+import threading
+
+from history import league_data_dir
+from storage import TeamRegistry, CoachingJournal, ReadySet, home_guild_id, write_json_atomic
+
+# Home league files, kept where the single-league bot stored them
+TEAMS_FILE = 'registered_teams.json'
+COACHING_HISTORY_FILE = 'coaching_history.jsonl'
+LEGACY_COACHING_HISTORY_FILE = 'coaching_history.json'
+SETTINGS_FILE = 'league_settings.json'
+READY_SNAPSHOT_FILE = 'ready_state.json'
+READY_JOURNAL_FILE = 'ready_state.journal'
+
+
+class League:
+    """One guild's league: registrations, coaching history, ready list and settings.
+
+    The home guild uses the original file locations; every other guild
+    keeps its files in its own data/guilds/<guild_id>/ directory.
+    """
+
+    def __init__(self, guild_id):
+        self.guild_id = guild_id
+        if guild_id == home_guild_id():
+            teams_file = TEAMS_FILE
+            coaching_file = COACHING_HISTORY_FILE
+            legacy_coaching_file = LEGACY_COACHING_HISTORY_FILE
+            self.settings_file = SETTINGS_FILE
+            ready_snapshot_file = READY_SNAPSHOT_FILE
+            ready_journal_file = READY_JOURNAL_FILE
+        else:
+            data_dir = league_data_dir(guild_id)
+            os.makedirs(data_dir, exist_ok=True)
+            teams_file = os.path.join(data_dir, TEAMS_FILE)
+            coaching_file = os.path.join(data_dir, COACHING_HISTORY_FILE)
+            legacy_coaching_file = None
+            self.settings_file = os.path.join(data_dir, SETTINGS_FILE)
+            ready_snapshot_file = os.path.join(data_dir, READY_SNAPSHOT_FILE)
+            ready_journal_file = os.path.join(data_dir, READY_JOURNAL_FILE)
+
+        self.teams = TeamRegistry(teams_file)
+        self.coaching = CoachingJournal(coaching_file, legacy_coaching_file)
+        self.ready_players = ReadySet(ready_snapshot_file, ready_journal_file)
+        self.settings = {}
+        if os.path.exists(self.settings_file):
+            with open(self.settings_file, 'r') as f:
+                self.settings = json.load(f)
+
+    @property
+    def player_count(self):
+        """Number of players needed before the all-ready ping."""
+        return self.settings.get('player_count', int(os.getenv('PLAYER_COUNT', 4)))
+
+    @property
+    def ready_channel_id(self):
+        """Channel for the all-ready ping, or 0 to use the command's channel."""
+        return self.settings.get('ready_channel_id', int(os.getenv('READY_CHANNEL_ID', 0)))
+
+    def update_settings(self, **changes):
+        """Change league settings and save them."""
+        self.settings.update(changes)
+        write_json_atomic(self.settings_file, self.settings)
+
+
+_leagues = {}
+_leagues_lock = threading.Lock()
+
+
+def get_league(guild_id):
+    """Get a guild's league state, loading it on first use.
+
+    Interactions outside a guild (guild_id None) use the home league.
+    """
+    guild_id = int(guild_id) if guild_id else home_guild_id()
+    league = _leagues.get(guild_id)
+    if league is None:
+        with _leagues_lock:
+            league = _leagues.get(guild_id)
+            if league is None:
+                league = _leagues[guild_id] = League(guild_id)
+    return league
@@ -0,0 +1,282 @@
+"""Concurrent load tests for the slash commands, run offline against fake Discord objects.
+
+Each scenario fires a burst of simultaneous interactions through the
+real bot.tree callbacks (see fake_discord.py) in a throwaway data
+directory, then reloads the JSON and CSV stores from disk to check that
+no concurrent update was lost:
+
+    python loadtest.py --users 500
+    python loadtest.py --users 2000 --scenario ready --rest-latency 0.05 --output results.json
+
+Reports throughput, latency percentiles, how many interactions were
+deferred automatically or acknowledged after Discord's 3 second
+deadline, and the per-phase command timings.
+"""
+import argparse
+import asyncio
+import json
+import os
+import random
+import shutil
+import sys
+import tempfile
+import time
+
+import history
+import metrics
+from cfb_teams import CFB_TEAMS
+from fake_discord import INTERACTION_DEADLINE, FakeGuild, FakeInteraction, FakeREST, autocomplete, invoke
+from leagues import get_league
+from storage import CoachingJournal, ReadySet, TeamRegistry
+
+SCENARIOS = ['register', 'ready', 'loggame', 'reads']
+
+
+def percentile(samples, q):
+    """Nearest-rank percentile of sorted samples."""
+    return samples[min(len(samples) - 1, int(len(samples) * q))] if samples else 0.0
+
+
+def check(name, expected, actual):
+    return {'check': name, 'expected': expected, 'actual': actual, 'ok': expected == actual}
+
+
+async def burst(tree, calls):
+    """Run (command, interaction, params) calls all at once and time each one."""
+    async def run(name, interaction, params):
+        error = await invoke(tree, name, interaction, **params)
+        return time.perf_counter() - interaction.created_at, interaction, error
+
+    start = time.perf_counter()
+    results = await asyncio.gather(*(run(*call) for call in calls))
+    return time.perf_counter() - start, results
+
+
+def summarize(scenario, elapsed, results, rest, checks):
+    """Throughput, latency percentiles and deadline misses for one burst, in milliseconds."""
+    latencies = sorted(latency * 1000 for latency, _, _ in results)
+    acks = sorted(i.ack_latency * 1000 for _, i, _ in results if i.ack_latency is not None)
+    errors = [f'{type(e).__name__}: {e}' for _, _, e in results if e is not None]
+    late = sum(1 for _, i, _ in results if i.ack_latency is None or i.ack_latency > INTERACTION_DEADLINE)
+    return {
+        'scenario': scenario,
+        'interactions': len(results),
+        'errors': len(errors),
+        'error_samples': errors[:5],
+        'seconds': elapsed,
+        'per_second': len(results) / elapsed if elapsed else 0.0,
+        'p50_ms': percentile(latencies, 0.5),
+        'p95_ms': percentile(latencies, 0.95),
+        'p99_ms': percentile(latencies, 0.99),
+        'max_ms': latencies[-1] if latencies else 0.0,
+        'ack_p99_ms': percentile(acks, 0.99),
+        'missed_deadline': late,
+        'deferred': sum(1 for _, i, _ in results if i.response.deferred),
+        'rest_calls': rest.calls,
+        'checks': checks,
+    }
+
+
+async def wait_for_ready_board(bot_module, guild):
+    """Let pending and in-flight ready board updates finish."""
+    board = bot_module.ready_boards.get(guild.id)
+    while board is not None:
+        if board.task is not None:
+            await board.task
+        elif board.lock.locked():
+            # The debounce task clears board.task before it publishes, under the lock
+            async with board.lock:
+                pass
+        else:
+            break
+
+
+async def run_register(bot_module, guild, channel, users, rng):
+    """Every user autocompletes a team name and registers at once, then half switch teams."""
+    tree = bot_module.bot.tree
+    names = sorted(CFB_TEAMS)
+    picks = {}
+    for user in users:
+        team = rng.choice(names)
+        prefix = team[:rng.randint(1, 4)]
+        choices = await autocomplete(tree, 'register', 'team', FakeInteraction(user, guild, channel), prefix)
+        picks[user.id] = choices[0].value if choices else team
+
+    calls = [('register', FakeInteraction(user, guild, channel), {'team': picks[user.id]}) for user in users]
+    elapsed, results = await burst(tree, calls)
+
+    switchers = users[::2]
+    for user in switchers:
+        picks[user.id] = rng.choice([name for name in names if name != picks[user.id]])
+    calls = [('register', FakeInteraction(user, guild, channel), {'team': picks[user.id]}) for user in switchers]
+    switch_elapsed, switch_results = await burst(tree, calls)
+
+    league = get_league(guild.id)
+    league.teams.flush()
+    saved = TeamRegistry(league.teams.path, save_delay=3600).all()
+    journal = CoachingJournal(league.coaching.path)
+    checks = [
+        check('registrations saved', len(users), len(saved)),
+        check('saved teams match', True, all(saved.get(str(user.id)) == picks[user.id] for user in users)),
+        check('coaching changes logged', len(switchers), len(journal.tail(len(switchers) + 1))),
+    ]
+    return elapsed + switch_elapsed, results + switch_results, checks
+
+
+async def run_ready(bot_module, guild, channel, users, rng):
+    """Every user readies at once; the all-ready ping should go out exactly once."""
+    tree = bot_module.bot.tree
+    league = get_league(guild.id)
+    league.update_settings(player_count=len(users))
+
+    calls = [('ready', FakeInteraction(user, guild, channel), {}) for user in users]
+    elapsed, results = await burst(tree, calls)
+    await wait_for_ready_board(bot_module, guild)
+
+    saved = ReadySet(league.ready_players.snapshot_path, league.ready_players.journal_path)
+    pings = [m for m in channel.messages.values() if m.content == '@here']
+    boards = [m for m in channel.messages.values() if m.content is None and m.embed and m.embed.title == 'Ready Status']
+    checks = [
+        check('ready players saved', len(users), len(saved)),
+        check('ping recorded', True, saved.pinged),
+        check('all-ready pings', 1, len(pings)),
+        check('ready board messages', 1, len(boards)),
+    ]
+    return elapsed, results, checks
+
+
+async def run_loggame(bot_module, guild, channel, users, rng):
+    """Every user logs a game at once; each should land in the CSV exactly once."""
+    tree = bot_module.bot.tree
+    names = sorted(CFB_TEAMS)
+    season = 2024
+    calls = []
+    for i, user in enumerate(users):
+        team1, team2 = rng.sample(names, 2)
+        calls.append(('loggame', FakeInteraction(user, guild, channel), {
+            'season': season, 'week': i % 14 + 1, 'team1': team1, 'score1': rng.randint(0, 56),
+            'team2': team2, 'score2': rng.randint(0, 56)}))
+    elapsed, results = await burst(tree, calls)
+
+    stored = sum(len(chunk) for chunk in history.get_store(guild.id).iter_games())
+    on_disk = len(history.load_game_history(history.league_data_dir(guild.id)))
+    checks = [
+        check('games in store', len(users), stored),
+        check('games in CSV', len(users), on_disk),
+    ]
+    return elapsed, results, checks
+
+
+async def run_reads(bot_module, guild, channel, users, rng):
+    """A mix of read-only commands at once, against whatever the earlier scenarios logged."""
+    tree = bot_module.bot.tree
+    names = sorted(CFB_TEAMS)
+    mix = [
+        ('status', lambda: {}),
+        ('teams', lambda: {}),
+        ('standings', lambda: {}),
+        ('h2h', lambda: dict(zip(('team1', 'team2'), rng.sample(names, 2)))),
+        ('teamhistory', lambda: {'team': rng.choice(names)}),
+        ('rankings', lambda: {}),
+        ('srs', lambda: {}),
+        ('champions', lambda: {}),
+    ]
+    calls = []
+    for user in users:
+        name, params = rng.choice(mix)
+        calls.append((name, FakeInteraction(user, guild, channel), params()))
+    elapsed, results = await burst(tree, calls)
+    unanswered = sum(1 for _, interaction, _ in results if not interaction.replies)
+    return elapsed, results, [check('every command replied', 0, unanswered)]
+
+
+RUNNERS = {
+    'register': run_register,
+    'ready': run_ready,
+    'loggame': run_loggame,
+    'reads': run_reads,
+}
+
+
+async def run_load_test(user_count, scenarios, rest_latency=0.0, rest_jitter=0.0, seed=0):
+    """Run each scenario in order against one fake guild and return the summaries."""
+    import bot as bot_module
+
+    rng = random.Random(seed)
+    rest = FakeREST(rest_latency, rest_jitter, seed)
+    guild = FakeGuild(member_count=user_count, rest=rest)
+    channel = guild.add_channel()
+    users = list(guild.members.values())
+    # Let the bot find the fake channels, as it would from the gateway cache
+    bot_module.bot.get_channel = guild.channels.get
+
+    summaries = []
+    for scenario in scenarios:
+        rest.calls = 0
+        elapsed, results, checks = await RUNNERS[scenario](bot_module, guild, channel, users, rng)
+        summaries.append(summarize(scenario, elapsed, results, rest, checks))
+    get_league(guild.id).teams.flush()
+    return summaries
+
+
+def print_report(summaries):
+    print(f"{'scenario':<10} {'calls':>6} {'errors':>6} {'per sec':>9} {'p50 ms':>8} {'p95 ms':>8} "
+          f"{'p99 ms':>8} {'max ms':>8} {'defer':>5} {'late':>5}")
+    for s in summaries:
+        print(f"{s['scenario']:<10} {s['interactions']:>6} {s['errors']:>6} {s['per_second']:>9.1f} "
+              f"{s['p50_ms']:>8.1f} {s['p95_ms']:>8.1f} {s['p99_ms']:>8.1f} {s['max_ms']:>8.1f} "
+              f"{s['deferred']:>5} {s['missed_deadline']:>5}")
+        for error in s['error_samples']:
+            print(f"    error: {error}")
+        for c in s['checks']:
+            status = 'ok' if c['ok'] else 'LOST UPDATE'
+            print(f"    {c['check']}: expected {c['expected']}, got {c['actual']} [{status}]")
+
+    print()
+    print(f"{'command':<24} {'calls':>6} {'p95 ms':>8} {'storage':>8} {'rest':>8} {'compute':>8}")
+    for s in metrics.command_summaries():
+        print(f"{s['command']:<24} {s['calls']:>6} {s['p95_ms']:>8.1f} {s['mean_storage_ms']:>8.1f} "
+              f"{s['mean_rest_ms']:>8.1f} {s['mean_compute_ms']:>8.1f}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--users', type=int, default=500, help='Simultaneous interactions per scenario')
+    parser.add_argument('--scenario', choices=SCENARIOS + ['all'], default='all')
+    parser.add_argument('--rest-latency', type=float, default=0.0, help='Seconds per fake Discord API call')
+    parser.add_argument('--rest-jitter', type=float, default=0.0, help='Extra random seconds per API call')
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--keep-data', action='store_true', help="Don't delete the temporary data directory")
+    parser.add_argument('--output', help='Also write JSON results here')
+    args = parser.parse_args(argv)
+
+    scenarios = SCENARIOS if args.scenario == 'all' else [args.scenario]
+    work_dir = tempfile.mkdtemp(prefix='cfb_loadtest_')
+    cwd = os.getcwd()
+    try:
+        # League JSON files live in the working directory, history under DATA_DIR
+        os.chdir(work_dir)
+        history.DATA_DIR = os.path.join(work_dir, 'data')
+        os.makedirs(history.DATA_DIR)
+        summaries = asyncio.run(run_load_test(args.users, scenarios, args.rest_latency, args.rest_jitter, args.seed))
+    finally:
+        # Write pending snapshots now, so nothing is left to save at exit once the directory is gone
+        history.save_snapshots()
+        os.chdir(cwd)
+        if args.keep_data:
+            print(f"Data kept in {work_dir}")
+        else:
+            shutil.rmtree(work_dir, ignore_errors=True)
+
+    print_report(summaries)
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump({'users': args.users, 'rest_latency': args.rest_latency, 'results': summaries}, f, indent=2)
+            f.write('\n')
+
+    failed = any(s['errors'] or not all(c['ok'] for c in s['checks']) for s in summaries)
+    return 1 if failed else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,189 @@
+"""Per-command latency histograms, split into storage, Discord REST and compute time.
+
+A command's timing is started when its interaction arrives and finished
+when it completes; code in between wraps blocking storage calls and
+Discord API calls in timed('storage') / timed('rest'), and whatever is
+left over counts as compute.
+"""
+import contextvars
+import functools
+import http.server
+import math
+import threading
+import time
+from contextlib import contextmanager
+
+# Histogram bucket upper bounds, in seconds
+BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, math.inf)
+PHASES = ('total', 'storage', 'rest', 'compute')
+
+_current = contextvars.ContextVar('command_timing', default=None)
+_lock = threading.Lock()
+_histograms = {}
+_errors = {}
+
+
+class Histogram:
+    """Cumulative latency histogram with fixed buckets."""
+
+    def __init__(self):
+        self.counts = [0] * len(BUCKETS)
+        self.total = 0.0
+        self.count = 0
+
+    def observe(self, seconds):
+        for i, bound in enumerate(BUCKETS):
+            if seconds <= bound:
+                self.counts[i] += 1
+                break
+        self.total += seconds
+        self.count += 1
+
+    def quantile(self, q):
+        """Approximate a quantile as the upper bound of the bucket it falls in.
+
+        Samples past the last finite bucket are reported at that bound.
+        """
+        if not self.count:
+            return 0.0
+        target = q * self.count
+        seen = 0
+        for bound, count in zip(BUCKETS, self.counts):
+            seen += count
+            if seen >= target:
+                break
+        return bound if bound != math.inf else BUCKETS[-2]
+
+
+class CommandTiming:
+    """Time spent in each phase while one command or autocomplete runs."""
+
+    def __init__(self, name):
+        self.name = name
+        self.start = time.perf_counter()
+        self.phases = {'storage': 0.0, 'rest': 0.0}
+        self.finished = False
+
+
+def start_command(name):
+    """Start timing a command in the current context and return its timing."""
+    timing = CommandTiming(name)
+    _current.set(timing)
+    return timing
+
+
+def finish_command(timing, error=False):
+    """Record a command's total, storage, REST and compute time."""
+    if timing is None or timing.finished:
+        return
+    timing.finished = True
+    total = time.perf_counter() - timing.start
+    durations = {
+        'total': total,
+        'storage': timing.phases['storage'],
+        'rest': timing.phases['rest'],
+        'compute': max(0.0, total - timing.phases['storage'] - timing.phases['rest']),
+    }
+    with _lock:
+        for phase, seconds in durations.items():
+            _histograms.setdefault((timing.name, phase), Histogram()).observe(seconds)
+        if error:
+            _errors[timing.name] = _errors.get(timing.name, 0) + 1
+
+
+@contextmanager
+def timed(phase):
+    """Add the time spent in this block to the current command's phase total."""
+    timing = _current.get()
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        if timing is not None:
+            timing.phases[phase] += time.perf_counter() - start
+
+
+def instrumented(name):
+    """Decorate an async callback (e.g. an autocomplete) so each call is timed as name."""
+    def decorator(func):
+        @functools.wraps(func)
+        async def wrapper(*args, **kwargs):
+            timing = start_command(name)
+            try:
+                return await func(*args, **kwargs)
+            finally:
+                finish_command(timing)
+        return wrapper
+    return decorator
+
+
+def command_summaries():
+    """Summarize every timed command, busiest first.
+
+    Returns dicts with the call and error counts, approximate p50/p95 total
+    latency, and mean time per phase, all in milliseconds.
+    """
+    with _lock:
+        names = {name for name, _ in _histograms}
+        summaries = []
+        for name in names:
+            total = _histograms[(name, 'total')]
+            summary = {
+                'command': name,
+                'calls': total.count,
+                'errors': _errors.get(name, 0),
+                'p50_ms': total.quantile(0.5) * 1000,
+                'p95_ms': total.quantile(0.95) * 1000,
+            }
+            for phase in PHASES:
+                histogram = _histograms[(name, phase)]
+                summary[f'mean_{phase}_ms'] = histogram.total / histogram.count * 1000 if histogram.count else 0.0
+            summaries.append(summary)
+    return sorted(summaries, key=lambda s: s['calls'], reverse=True)
+
+
+def render_prometheus():
+    """Render all histograms in the Prometheus text exposition format."""
+    lines = [
+        '# HELP cfb_bot_command_duration_seconds Slash command and autocomplete latency by phase.',
+        '# TYPE cfb_bot_command_duration_seconds histogram',
+    ]
+    with _lock:
+        for (name, phase), histogram in sorted(_histograms.items()):
+            labels = f'command="{name}",phase="{phase}"'
+            cumulative = 0
+            for bound, count in zip(BUCKETS, histogram.counts):
+                cumulative += count
+                le = '+Inf' if bound == math.inf else repr(bound)
+                lines.append(f'cfb_bot_command_duration_seconds_bucket{{{labels},le="{le}"}} {cumulative}')
+            lines.append(f'cfb_bot_command_duration_seconds_sum{{{labels}}} {histogram.total}')
+            lines.append(f'cfb_bot_command_duration_seconds_count{{{labels}}} {histogram.count}')
+
+        lines.append('# HELP cfb_bot_command_errors_total Commands that ended in an error.')
+        lines.append('# TYPE cfb_bot_command_errors_total counter')
+        for name, count in sorted(_errors.items()):
+            lines.append(f'cfb_bot_command_errors_total{{command="{name}"}} {count}')
+    return '\n'.join(lines) + '\n'
+
+
+class _MetricsHandler(http.server.BaseHTTPRequestHandler):
+    def do_GET(self):
+        if self.path != '/metrics':
+            self.send_error(404)
+            return
+        body = render_prometheus().encode('utf-8')
+        self.send_response(200)
+        self.send_header('Content-Type', 'text/plain; version=0.0.4')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def serve_metrics(port, host='127.0.0.1'):
+    """Serve /metrics on a local port from a background thread."""
+    server = http.server.ThreadingHTTPServer((host, port), _MetricsHandler)
+    threading.Thread(target=server.serve_forever, name='metrics', daemon=True).start()
+    return server
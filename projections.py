@@ -0,0 +1,175 @@
+"""Monte Carlo projections for the rest of a season.
+
+The game log has no schedule, so each remaining week pairs the season's
+teams at random. Games are decided by Elo win probability from the
+current power ratings; afterwards the top teams by wins (ties broken by
+rating) play a seeded single-elimination playoff. Each chunk of
+simulations runs as NumPy arrays of shape (simulations, teams) in a
+worker process and returns only the aggregated counts.
+"""
+import asyncio
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+import history
+import ratings
+from storage import run_storage
+
+REGULAR_SEASON_WEEKS = 14
+PLAYOFF_TEAMS = 4
+DEFAULT_SIMULATIONS = 20000
+MAX_SIMULATIONS = 100000
+# Simulations per worker task, which bounds each worker's memory use
+CHUNK_SIMULATIONS = 10000
+
+PROJECTION_WORKERS = int(os.getenv('PROJECTION_WORKERS', os.cpu_count() or 1))
+_pool = None
+
+
+def win_probability(rating1, rating2):
+    """Elo probability that the team rated rating1 beats the team rated rating2."""
+    return 1 / (1 + np.power(10.0, (rating2 - rating1) / 400))
+
+
+def projection_inputs(season=None, regular_season_weeks=REGULAR_SEASON_WEEKS, guild_id=None):
+    """Gather a season's teams, current wins, ratings and weeks left, or None if it has no games.
+
+    season defaults to the latest season with games.
+    """
+    seasons = history.get_all_seasons(guild_id)
+    if not seasons:
+        return None
+    season = season or seasons[0]
+
+    records = history.get_standings(season, guild_id)
+    if not records:
+        return None
+    last_week = history.get_last_week(season, guild_id)
+
+    current = dict(ratings.get_rankings(guild_id))
+    teams = [team for team, _ in records]
+    return {
+        'season': season,
+        'teams': teams,
+        'wins': np.array([record['wins'] for _, record in records], dtype=np.int32),
+        'ratings': np.array([current[team]['rating'] if team in current else ratings.INITIAL_RATING
+                             for team in teams]),
+        'first_week': last_week + 1,
+        'weeks_left': max(0, regular_season_weeks - last_week),
+    }
+
+
+def simulate_chunk(team_ratings, wins, weeks_left, playoff_teams, simulations, seed):
+    """Simulate the rest of the season and the playoff simulations times.
+
+    Returns {'win_counts': (teams, max_wins + 1) array, 'playoffs': (teams,),
+    'titles': (teams,)} counts summed over the simulations.
+    """
+    rng = np.random.default_rng(seed)
+    team_count = len(team_ratings)
+    probability = win_probability(team_ratings[:, None], team_ratings[None, :])
+    row_offsets = np.arange(simulations)[:, None] * team_count
+
+    # Random pairings each week; with an odd team count the last team has a bye.
+    # Winners are collected as flat (simulation, team) indexes and counted once.
+    pairs = team_count // 2
+    winners = []
+    for _ in range(weeks_left):
+        order = np.argsort(rng.random((simulations, team_count), dtype=np.float32), axis=1)
+        home, away = order[:, 0:2 * pairs:2], order[:, 1:2 * pairs:2]
+        home_won = rng.random(home.shape, dtype=np.float32) < probability[home, away]
+        winners.append((row_offsets + np.where(home_won, home, away)).ravel())
+    final_wins = np.tile(wins, (simulations, 1))
+    if winners:
+        final_wins += np.bincount(np.concatenate(winners), minlength=simulations * team_count).reshape(
+            simulations, team_count).astype(final_wins.dtype)
+
+    # Seed by wins, then rating, then a coin flip
+    spread = np.ptp(team_ratings) or 1.0
+    tiebreak = (team_ratings - team_ratings.min()) / spread * 0.5 + rng.random((simulations, team_count)) * 1e-6
+    bracket = np.argsort(-(final_wins + tiebreak), axis=1)[:, :playoff_teams]
+    playoffs = np.bincount(bracket.ravel(), minlength=team_count)
+
+    # Best remaining seed plays worst remaining seed each round
+    while bracket.shape[1] > 1:
+        half = bracket.shape[1] // 2
+        high, low = bracket[:, :half], bracket[:, half:][:, ::-1]
+        high_won = rng.random(high.shape) < probability[high, low]
+        bracket = np.where(high_won, high, low)
+    titles = np.bincount(bracket[:, 0], minlength=team_count)
+
+    max_wins = int(wins.max()) + weeks_left
+    flat = (np.arange(team_count) * (max_wins + 1) + final_wins).ravel()
+    win_counts = np.bincount(flat, minlength=team_count * (max_wins + 1)).reshape(team_count, max_wins + 1)
+    return {'win_counts': win_counts, 'playoffs': playoffs, 'titles': titles}
+
+
+def summarize(inputs, chunks, simulations):
+    """Combine chunk counts into per-team projections, best title odds first."""
+    win_counts = sum(chunk['win_counts'] for chunk in chunks)
+    playoffs = sum(chunk['playoffs'] for chunk in chunks)
+    titles = sum(chunk['titles'] for chunk in chunks)
+
+    cumulative = np.cumsum(win_counts, axis=1) / simulations
+    projections = []
+    for i, team in enumerate(inputs['teams']):
+        projections.append({
+            'team': team,
+            'wins': int(inputs['wins'][i]),
+            'mean_wins': float(win_counts[i] @ np.arange(win_counts.shape[1]) / simulations),
+            'wins_low': int(np.searchsorted(cumulative[i], 0.1)),
+            'wins_high': int(np.searchsorted(cumulative[i], 0.9)),
+            'win_distribution': win_counts[i].tolist(),
+            'playoff_odds': float(playoffs[i] / simulations),
+            'title_odds': float(titles[i] / simulations),
+        })
+    return sorted(projections, key=lambda p: (-p['title_odds'], -p['playoff_odds'], -p['mean_wins']))
+
+
+def process_pool():
+    """Get the shared worker process pool, starting it on first use.
+
+    Workers come from a fork server (or are spawned where that isn't
+    available) rather than forked from the bot, whose storage, timer and
+    metrics threads could leave a forked child deadlocked.
+    """
+    global _pool
+    if _pool is None:
+        method = 'forkserver' if 'forkserver' in multiprocessing.get_all_start_methods() else 'spawn'
+        _pool = ProcessPoolExecutor(max_workers=PROJECTION_WORKERS, mp_context=multiprocessing.get_context(method))
+    return _pool
+
+
+def chunk_sizes(simulations):
+    """Split simulations into worker tasks, at least one per worker."""
+    count = max(min(PROJECTION_WORKERS, simulations), -(-simulations // CHUNK_SIMULATIONS))
+    return [len(part) for part in np.array_split(np.arange(simulations), count)]
+
+
+async def project_season(season=None, simulations=DEFAULT_SIMULATIONS, regular_season_weeks=REGULAR_SEASON_WEEKS,
+                         playoff_teams=PLAYOFF_TEAMS, guild_id=None, seed=0):
+    """Project a season without blocking the event loop.
+
+    Inputs are gathered on the storage threads and the simulations run on
+    the process pool. Returns None if the season has no games; raises
+    ValueError if playoff_teams isn't a power of two that fits the season.
+    """
+    inputs = await run_storage(projection_inputs, season, regular_season_weeks, guild_id)
+    if inputs is None:
+        return None
+    if playoff_teams < 1 or playoff_teams & (playoff_teams - 1) or playoff_teams > len(inputs['teams']):
+        raise ValueError(f"The playoff needs a power of two teams, at most {len(inputs['teams'])}.")
+
+    loop = asyncio.get_running_loop()
+    sizes = chunk_sizes(simulations)
+    seeds = np.random.SeedSequence(seed).spawn(len(sizes))
+    chunks = await asyncio.gather(*(
+        loop.run_in_executor(process_pool(), simulate_chunk, inputs['ratings'], inputs['wins'],
+                             inputs['weeks_left'], playoff_teams, size, chunk_seed)
+        for size, chunk_seed in zip(sizes, seeds)
+    ))
+    return dict(inputs, simulations=simulations, playoff_teams=playoff_teams,
+                projections=summarize(inputs, chunks, simulations))
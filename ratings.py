@@ -0,0 +1,201 @@
+"""Elo power ratings over the game log.
+
+Ratings use a margin-of-victory multiplier and regress toward the mean
+at the start of each season. All games in the same season and week are
+rated from the ratings at the start of that week, which lets a full
+recompute process a week at a time as NumPy arrays, and gives the same
+result as applying games one by one as they're logged.
+
+Each league's ratings are built from its whole history on first use and
+then kept current by a history listener as games are saved.
+"""
+import threading
+
+import numpy as np
+
+import history
+
+INITIAL_RATING = 1500.0
+K_FACTOR = 20.0
+# Fraction of the distance to the mean removed at the start of each season
+SEASON_REGRESSION = 1 / 3
+
+
+def elo_delta(rating1, rating2, score1, score2, k_factor=K_FACTOR):
+    """Rating points team1 gains (and team2 loses) from one game.
+
+    Works elementwise on NumPy arrays as well as on single values.
+    """
+    expected = 1 / (1 + np.power(10.0, (rating2 - rating1) / 400))
+    result = np.where(score1 > score2, 1.0, np.where(score1 < score2, 0.0, 0.5))
+    # Bigger wins count more, but less so when the favorite ran up the score
+    winner_edge = np.where(score1 > score2, rating1 - rating2, rating2 - rating1)
+    multiplier = np.log(np.abs(score1 - score2) + 1) * 2.2 / (winner_edge * 0.001 + 2.2)
+    return k_factor * multiplier * (result - expected)
+
+
+def compute_ratings(games, k_factor=K_FACTOR, regression=SEASON_REGRESSION, initial=INITIAL_RATING):
+    """Rate every team from a full list of games, one week per vectorized step.
+
+    Returns (ratings, games_played, week_base, last_game): ratings and
+    games_played are {team: value}; week_base holds the start-of-week
+    ratings of teams that played in the final week, and last_game its
+    (season, week), so more games from that week can be applied later.
+    """
+    teams = {}
+    columns = np.array([
+        (game['season'], game['week'], teams.setdefault(game['team1'], len(teams)),
+         teams.setdefault(game['team2'], len(teams)), game['score1'], game['score2'])
+        for game in games
+    ], dtype=np.int64).reshape(-1, 6)
+    if not len(columns):
+        return {}, {}, {}, None
+
+    # Stable sort, so games within a week keep their logged order
+    columns = columns[np.lexsort((columns[:, 1], columns[:, 0]))]
+    seasons, weeks, team1, team2, score1, score2 = columns.T
+
+    ratings = np.full(len(teams), initial)
+    seen = np.zeros(len(teams), dtype=bool)
+    week_start = ratings
+    bounds = np.flatnonzero((np.diff(seasons) != 0) | (np.diff(weeks) != 0)) + 1
+    for start, end in zip(np.concatenate(([0], bounds)), np.concatenate((bounds, [len(columns)]))):
+        if start and seasons[start] != seasons[start - 1]:
+            mean = ratings[seen].mean()
+            ratings[seen] = mean + (ratings[seen] - mean) * (1 - regression)
+        week_start = ratings.copy()
+        t1, t2 = team1[start:end], team2[start:end]
+        delta = elo_delta(week_start[t1], week_start[t2], score1[start:end], score2[start:end], k_factor)
+        np.add.at(ratings, t1, delta)
+        np.add.at(ratings, t2, -delta)
+        seen[t1] = seen[t2] = True
+
+    names = list(teams)
+    played = np.bincount(team1, minlength=len(teams)) + np.bincount(team2, minlength=len(teams))
+    last_week = np.concatenate((t1, t2))
+    return (
+        {name: float(ratings[i]) for i, name in enumerate(names)},
+        {name: int(played[i]) for i, name in enumerate(names)},
+        {names[i]: float(week_start[i]) for i in set(last_week.tolist())},
+        (int(seasons[-1]), int(weeks[-1])),
+    )
+
+
+class EloRatings:
+    """One league's Elo ratings, kept current as games are logged.
+
+    processed counts the games of the store's log already applied. New
+    games are applied one at a time; a game logged for an earlier week
+    than the latest rated one marks the ratings stale, and the next
+    catch_up recomputes them from the whole log.
+    """
+
+    def __init__(self, k_factor=K_FACTOR, regression=SEASON_REGRESSION, initial=INITIAL_RATING):
+        self.lock = threading.Lock()
+        self.k_factor = k_factor
+        self.regression = regression
+        self.initial = initial
+        self.store = None
+        self.processed = 0
+        self.ratings = {}
+        self.games_played = {}
+        self.week_base = {}
+        self.last_game = None
+
+    def set_params(self, **params):
+        """Change k_factor, regression or initial; the next catch_up recomputes everything."""
+        with self.lock:
+            for name, value in params.items():
+                if name not in ('k_factor', 'regression', 'initial'):
+                    raise ValueError(f"Unknown rating parameter: {name}")
+                setattr(self, name, value)
+            self.store = None
+
+    def catch_up(self, store):
+        """Apply games logged to store since the last call."""
+        with self.lock:
+            if store is not self.store:
+                self._recompute(store)
+                return
+            for chunk in store.iter_games(self.processed):
+                for game in chunk:
+                    if not self._apply_game(game):
+                        self._recompute(store)
+                        return
+                    self.processed += 1
+
+    def _recompute(self, store):
+        """Rebuild the ratings from the whole log. Caller holds the lock."""
+        games = [game for chunk in store.iter_games() for game in chunk]
+        self.ratings, self.games_played, self.week_base, self.last_game = compute_ratings(
+            games, self.k_factor, self.regression, self.initial)
+        self.processed = len(games)
+        self.store = store
+
+    def _apply_game(self, game):
+        """Rate one new game. Returns False if it's from before the latest rated week."""
+        when = (game['season'], game['week'])
+        if self.last_game is not None and when < self.last_game:
+            return False
+        if self.last_game is None or when != self.last_game:
+            if self.last_game is not None and game['season'] != self.last_game[0] and self.ratings:
+                mean = sum(self.ratings.values()) / len(self.ratings)
+                for team, rating in self.ratings.items():
+                    self.ratings[team] = mean + (rating - mean) * (1 - self.regression)
+            self.week_base = {}
+            self.last_game = when
+
+        team1, team2 = game['team1'], game['team2']
+        for team in (team1, team2):
+            if team not in self.ratings:
+                self.ratings[team] = self.initial
+                self.games_played[team] = 0
+            self.week_base.setdefault(team, self.ratings[team])
+
+        delta = float(elo_delta(self.week_base[team1], self.week_base[team2],
+                                game['score1'], game['score2'], self.k_factor))
+        self.ratings[team1] += delta
+        self.ratings[team2] -= delta
+        self.games_played[team1] += 1
+        self.games_played[team2] += 1
+        return True
+
+    def rankings(self):
+        """Get (team, {'rating', 'games'}) pairs, highest rating first."""
+        with self.lock:
+            return [
+                (team, {'rating': rating, 'games': self.games_played[team]})
+                for team, rating in sorted(self.ratings.items(), key=lambda item: -item[1])
+            ]
+
+
+# Ratings per league data directory
+_engines = {}
+_engines_lock = threading.Lock()
+
+
+def get_engine(guild_id=None):
+    """Get a league's ratings engine, creating it on first use."""
+    data_dir = history.league_data_dir(guild_id)
+    with _engines_lock:
+        engine = _engines.get(data_dir)
+        if engine is None:
+            engine = _engines[data_dir] = EloRatings()
+    return engine
+
+
+def get_rankings(guild_id=None):
+    """Get a league's power rankings, highest rating first."""
+    engine = get_engine(guild_id)
+    engine.catch_up(history.get_store(guild_id))
+    return engine.rankings()
+
+
+def _on_games_saved(guild_id):
+    """Keep already-built ratings current as games are saved."""
+    engine = _engines.get(history.league_data_dir(guild_id))
+    if engine is not None:
+        engine.catch_up(history.get_store(guild_id))
+
+
+history.add_game_listener(_on_games_saved)
@@ -0,0 +1,271 @@
+"""Persistence for the bot's JSON state files."""
+import asyncio
+import atexit
+import functools
+import json
+import os
+import tempfile
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import metrics
+
+# Seconds to wait after a change before writing, so bursts coalesce
+SAVE_DELAY = 2.0
+
+# Guild whose league keeps using the original single-league file locations
+DEFAULT_HOME_GUILD_ID = 671891039765790731
+
+# Threads for blocking file I/O and history queries
+STORAGE_WORKERS = int(os.getenv('STORAGE_WORKERS', 4))
+_executor = ThreadPoolExecutor(max_workers=STORAGE_WORKERS, thread_name_prefix='storage')
+
+
+def home_guild_id():
+    """Get the home guild ID (HOME_GUILD_ID, read when called so .env has loaded)."""
+    return int(os.getenv('HOME_GUILD_ID', DEFAULT_HOME_GUILD_ID))
+
+
+async def run_storage(func, *args, **kwargs):
+    """Run a blocking storage call on the storage thread pool and await it."""
+    loop = asyncio.get_running_loop()
+    with metrics.timed('storage'):
+        return await loop.run_in_executor(_executor, functools.partial(func, *args, **kwargs))
+
+
+def write_bytes_atomic(path, data):
+    """Write bytes to a temp file next to path, then rename it into place."""
+    directory = os.path.dirname(os.path.abspath(path))
+    fd, tmp_path = tempfile.mkstemp(dir=directory, prefix=f'.{os.path.basename(path)}.', suffix='.tmp')
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            f.write(data)
+        os.replace(tmp_path, path)
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
+
+
+def write_json_atomic(path, data):
+    """Write JSON to a temp file next to path, then rename it into place."""
+    write_bytes_atomic(path, json.dumps(data, indent=2).encode('utf-8'))
+
+
+class TeamRegistry:
+    """In-memory user-to-team registrations with debounced, atomic saves.
+
+    The JSON file is read once and every lookup is served from memory.
+    Changes are written back SAVE_DELAY seconds after the first unsaved
+    one, so a burst of registrations becomes a single write.
+    """
+
+    def __init__(self, path, save_delay=SAVE_DELAY):
+        self.path = path
+        self.save_delay = save_delay
+        self.lock = threading.Lock()
+        self._write_lock = threading.Lock()
+        self._timer = None
+        self._dirty = False
+        self.teams = {}
+        if os.path.exists(path):
+            with open(path, 'r') as f:
+                self.teams = json.load(f)
+        atexit.register(self.flush)
+
+    def get_team(self, user_id):
+        """Get the team name a user registered, or None."""
+        return self.teams.get(str(user_id))
+
+    def all(self):
+        """Get a snapshot of all registrations as {user_id: team_name}."""
+        with self.lock:
+            return dict(self.teams)
+
+    def register(self, user_id, team_name):
+        """Register a user's team and return their previous team, if any."""
+        with self.lock:
+            old_team = self.teams.get(str(user_id))
+            self.teams[str(user_id)] = team_name
+            self._schedule_save()
+        return old_team
+
+    def _schedule_save(self):
+        """Start the save timer unless one is already pending. Caller holds the lock."""
+        self._dirty = True
+        if self._timer is None:
+            self._timer = threading.Timer(self.save_delay, self.flush)
+            self._timer.daemon = True
+            self._timer.start()
+
+    def flush(self):
+        """Write pending changes to disk now."""
+        with self._write_lock:
+            with self.lock:
+                if self._timer is not None:
+                    self._timer.cancel()
+                    self._timer = None
+                if not self._dirty:
+                    return
+                snapshot = dict(self.teams)
+                self._dirty = False
+            write_json_atomic(self.path, snapshot)
+
+
+class CoachingJournal:
+    """Append-only JSON Lines log of coaching changes.
+
+    Each change is one line appended to the file, and recent changes are
+    read by seeking back from the end instead of parsing the whole log.
+    """
+
+    def __init__(self, path, legacy_path=None):
+        self.path = path
+        self.lock = threading.Lock()
+        if legacy_path and os.path.exists(legacy_path) and not os.path.exists(path):
+            self._import_legacy(legacy_path)
+
+    def _import_legacy(self, legacy_path):
+        """Convert an old JSON-list history file into the journal format."""
+        with open(legacy_path, 'r') as f:
+            entries = json.load(f)
+        directory = os.path.dirname(os.path.abspath(self.path))
+        fd, tmp_path = tempfile.mkstemp(dir=directory, prefix=f'.{os.path.basename(self.path)}.', suffix='.tmp')
+        with os.fdopen(fd, 'w') as f:
+            for entry in entries:
+                f.write(json.dumps(entry) + '\n')
+        os.replace(tmp_path, self.path)
+
+    def append(self, entry):
+        """Append one change to the journal."""
+        line = json.dumps(entry) + '\n'
+        with self.lock:
+            with open(self.path, 'a') as f:
+                f.write(line)
+
+    def tail(self, count, block_size=4096):
+        """Get the last count changes, oldest first."""
+        if count <= 0 or not os.path.exists(self.path):
+            return []
+
+        with open(self.path, 'rb') as f:
+            f.seek(0, os.SEEK_END)
+            end = f.tell()
+            data = b''
+            # Read backwards until there are more line breaks than lines wanted
+            while end > 0 and data.count(b'\n') <= count:
+                start = max(0, end - block_size)
+                f.seek(start)
+                data = f.read(end - start) + data
+                end = start
+
+        lines = [line for line in data.splitlines() if line.strip()]
+        return [json.loads(line) for line in lines[-count:]]
+
+
+class ReadySet:
+    """Set of ready user IDs, persisted as a JSON snapshot plus a change journal.
+
+    Each change appends one short line to the journal ("+id", "-id",
+    "clear" or "pinged"). At startup the snapshot is loaded and the journal
+    replayed on top; once the journal grows past COMPACT_AFTER lines it is
+    folded into a new snapshot. Replaying a journal over a newer snapshot
+    gives the same state, so a crash between those two steps is harmless.
+
+    pinged records whether this week's everyone-is-ready ping went out; it
+    is reset by clear.
+    """
+
+    COMPACT_AFTER = 200
+
+    def __init__(self, snapshot_path, journal_path):
+        self.snapshot_path = snapshot_path
+        self.journal_path = journal_path
+        self.lock = threading.Lock()
+        self.players = set()
+        self.pinged = False
+        self._journal_lines = 0
+
+        if os.path.exists(snapshot_path):
+            with open(snapshot_path, 'r') as f:
+                snapshot = json.load(f)
+            # Older snapshots are a bare list of user IDs
+            if isinstance(snapshot, list):
+                snapshot = {'players': snapshot}
+            self.players = set(snapshot['players'])
+            self.pinged = snapshot.get('pinged', False)
+        if os.path.exists(journal_path):
+            with open(journal_path, 'r') as f:
+                for line in f:
+                    self._apply(line.strip())
+                    self._journal_lines += 1
+
+    def _apply(self, entry):
+        if entry == 'clear':
+            self.players.clear()
+            self.pinged = False
+        elif entry == 'pinged':
+            self.pinged = True
+        elif entry.startswith('+'):
+            self.players.add(int(entry[1:]))
+        elif entry.startswith('-'):
+            self.players.discard(int(entry[1:]))
+
+    def __contains__(self, user_id):
+        return user_id in self.players
+
+    def __len__(self):
+        return len(self.players)
+
+    def __iter__(self):
+        with self.lock:
+            return iter(list(self.players))
+
+    def add(self, user_id):
+        """Mark a user ready. Returns False if they already were."""
+        with self.lock:
+            if user_id in self.players:
+                return False
+            self.players.add(user_id)
+            self._log(f'+{user_id}')
+        return True
+
+    def discard(self, user_id):
+        """Unmark a user. Returns False if they weren't ready."""
+        with self.lock:
+            if user_id not in self.players:
+                return False
+            self.players.discard(user_id)
+            self._log(f'-{user_id}')
+        return True
+
+    def clear(self):
+        """Unmark everyone, reset the weekly ping, and return how many were ready."""
+        with self.lock:
+            count = len(self.players)
+            self.players.clear()
+            self.pinged = False
+            self._log('clear')
+        return count
+
+    def mark_pinged(self):
+        """Record that the everyone-is-ready ping went out. Returns False if it already had."""
+        with self.lock:
+            if self.pinged:
+                return False
+            self.pinged = True
+            self._log('pinged')
+        return True
+
+    def _log(self, entry):
+        """Append one change to the journal. Caller holds the lock."""
+        with open(self.journal_path, 'a') as f:
+            f.write(entry + '\n')
+        self._journal_lines += 1
+        if self._journal_lines > self.COMPACT_AFTER:
+            self._compact()
+
+    def _compact(self):
+        """Fold the journal into a fresh snapshot. Caller holds the lock."""
+        write_json_atomic(self.snapshot_path, {'players': sorted(self.players), 'pinged': self.pinged})
+        open(self.journal_path, 'w').close()
+        self._journal_lines = 0